@@ -1,9 +1,14 @@
 """Generic cache utilities for subburn."""
 
+import atexit
+import contextlib
 import functools
 import hashlib
 import inspect
 import json
+import os
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Protocol, TypeVar, cast
@@ -11,6 +16,13 @@ from typing import Any, Protocol, TypeVar, cast
 from pydantic import BaseModel, ValidationError
 from xdg_base_dirs import xdg_cache_home
 
+from . import debug
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 
 class Serializable(Protocol):
     """Protocol for objects that can be serialized."""
@@ -24,43 +36,123 @@ class HasToDict(Protocol):
     def to_dict(self) -> dict[str, Any]: ...
 
 
-# Create cache directory path
-CACHE_DIR = xdg_cache_home() / "subburn"
+# Create cache directory path; SUBBURN_CACHE_DIR overrides the XDG location
+CACHE_DIR = (
+    Path(os.environ["SUBBURN_CACHE_DIR"]) if os.environ.get("SUBBURN_CACHE_DIR") else xdg_cache_home() / "subburn"
+)
+
+# Pending cache writes are batched and flushed after a short delay, once enough
+# entries accumulate, or at interpreter exit. They are held encoded, so that
+# callers can't mutate a queued entry and each load decodes its own copy.
+FLUSH_INTERVAL = 0.5  # seconds
+FLUSH_THRESHOLD = 32  # entries
+
+_pending_writes: dict[Path, bytes] = {}
+_pending_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+
+# Number of cache files whose contents (or absence) are remembered in memory
+READ_CACHE_SIZE = 1024
+
+# Least recently used entries first; guarded by _pending_lock
+_read_cache: OrderedDict[Path, bytes | None] = OrderedDict()
 
 # Type variables for the decorator
 T = TypeVar("T")
 R = TypeVar("R")
 
 
+@functools.cache
+def _make_dir(path: Path) -> Path:
+    """Create a directory, at most once per process."""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def ensure_cache_dir() -> Path:
     """Ensure the cache directory exists and return its path."""
-    cache_dir = CACHE_DIR
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir
+    return _make_dir(CACHE_DIR)
 
 
-def compute_content_hash(content: str) -> str:
+# Cache keys need no cryptographic strength; 128-bit BLAKE2b is faster than
+# SHA-256 and yields shorter file names
+CACHE_KEY_DIGEST_SIZE = 16
+
+
+def _new_key_hash() -> hashlib.blake2b:
+    """Create the hash object used for cache keys."""
+    return hashlib.blake2b(digest_size=CACHE_KEY_DIGEST_SIZE)
+
+
+def compute_content_hash(content: str | bytes) -> str:
     """Compute a hash of the content."""
-    return hashlib.sha256(content.encode()).hexdigest()
+    h = _new_key_hash()
+    h.update(content.encode() if isinstance(content, str) else content)
+    return h.hexdigest()
+
+
+# Files are hashed in chunks so that large media files aren't read into memory at once
+FILE_HASH_CHUNK_SIZE = 1 << 20
+
+
+def compute_file_hash(path: Path) -> str:
+    """Compute a hash of a file's contents."""
+    h = _new_key_hash()
+    with open(path, "rb") as f:
+        while chunk := f.read(FILE_HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _serialize_atom(value: Any) -> Any:
+    return value
+
+
+def _serialize_sequence(value: list[Any] | tuple[Any, ...]) -> list[Any]:
+    # Flat lists of JSON-native scalars are returned as-is, without a copy
+    if type(value) is list and all(type(item) in _JSON_ATOMIC for item in value):
+        return value
+    return [serialize_value(item) for item in value]
+
+
+def _serialize_dict(value: dict[Any, Any]) -> dict[Any, Any]:
+    return {k: serialize_value(value[k]) for k in sorted(value)}
+
+
+# Serializers for exact types, looked up by type(value)
+_SERIALIZERS: dict[type, Callable[[Any], Any]] = {
+    type(None): _serialize_atom,
+    str: _serialize_atom,
+    int: _serialize_atom,
+    float: _serialize_atom,
+    bool: _serialize_atom,
+    list: _serialize_sequence,
+    tuple: _serialize_sequence,
+    dict: _serialize_dict,
+}
+
+# Exact types that serialize to themselves
+_JSON_ATOMIC = frozenset(t for t, serializer in _SERIALIZERS.items() if serializer is _serialize_atom)
 
 
 def serialize_value(value: Any) -> Any:
     """Serialize a value to a form that can be reliably hashed."""
-    # Handle None
-    if value is None:
-        return None
+    # Dispatch on the exact type for the common cases
+    serializer = _SERIALIZERS.get(type(value))
+    if serializer is not None:
+        return serializer(value)
 
-    # Handle basic types
+    # Handle subclasses of basic types (such as str enums)
     if isinstance(value, str | int | float | bool):
         return value
 
-    # Handle lists and tuples
+    # Handle subclasses of lists and tuples
     if isinstance(value, list | tuple):
-        return [serialize_value(item) for item in value]
+        return _serialize_sequence(value)
 
-    # Handle dictionaries
+    # Handle subclasses of dictionaries
     if isinstance(value, dict):
-        return {k: serialize_value(v) for k, v in sorted(value.items())}
+        return _serialize_dict(value)
 
     # Handle pydantic models
     if isinstance(value, BaseModel):
@@ -72,12 +164,43 @@ def serialize_value(value: Any) -> Any:
 
     # Handle objects with __dict__ attribute
     if hasattr(value, "__dict__"):
-        return serialize_value(value.__dict__)
+        return _serialize_dict(value.__dict__)
 
     # Handle any other object by converting to string
     return str(value)
 
 
+def _hash_update(h: hashlib.blake2b, value: Any) -> None:
+    """Feed a serialized value into a hash object without building a JSON string.
+
+    Each value is prefixed with a type tag, and containers with their length, so
+    that structurally different values cannot produce the same byte stream.
+    """
+    if value is None:
+        h.update(b"N")
+    elif isinstance(value, bool):
+        h.update(b"T" if value else b"F")
+    elif isinstance(value, int):
+        h.update(b"i%d;" % value)
+    elif isinstance(value, float):
+        h.update(b"f" + repr(value).encode() + b";")
+    elif isinstance(value, str):
+        encoded = value.encode()
+        h.update(b"s%d:" % len(encoded))
+        h.update(encoded)
+    elif isinstance(value, list | tuple):
+        h.update(b"l%d:" % len(value))
+        for item in value:
+            _hash_update(h, item)
+    elif isinstance(value, dict):
+        h.update(b"d%d:" % len(value))
+        for k in sorted(value):
+            _hash_update(h, k)
+            _hash_update(h, value[k])
+    else:
+        _hash_update(h, str(value))
+
+
 def compute_cache_key(**kwargs: Any) -> str:
     """Compute a cache key based on parameters.
 
@@ -90,11 +213,10 @@ def compute_cache_key(**kwargs: Any) -> str:
     # Serialize all parameters
     serialized_params = {k: serialize_value(v) for k, v in kwargs.items()}
 
-    # Convert to a deterministic JSON string
-    param_str = json.dumps(serialized_params, sort_keys=True)
-
-    # Hash the string
-    return compute_content_hash(param_str)
+    # Stream the parameters into the hash in a deterministic order
+    h = _new_key_hash()
+    _hash_update(h, serialized_params)
+    return h.hexdigest()
 
 
 def get_cache_path(cache_type: str, cache_key: str) -> Path:
@@ -111,19 +233,125 @@ def get_cache_path(cache_type: str, cache_key: str) -> Path:
     return cache_dir / f"{cache_type}_{cache_key}.json"
 
 
+def _dump_cache_data(data: dict[str, Any]) -> bytes:
+    """Encode cache data as UTF-8 JSON, indented only when debugging."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if debug.DEBUG_LEVEL > 0:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    indent = 2 if debug.DEBUG_LEVEL > 0 else None
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def _load_cache_data(content: bytes) -> Any:
+    """Decode UTF-8 JSON cache data."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def flush_cache() -> None:
+    """Write all pending cache entries to disk."""
+    global _flush_timer
+
+    with _pending_lock:
+        pending = dict(_pending_writes)
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+
+    written: dict[Path, bytes] = {}
+    for cache_path, content in pending.items():
+        # Write to a temporary file and rename it into place, so that readers
+        # never see a partially written cache file. The timer thread and the main
+        # thread can flush the same entry at once, so the name is per thread.
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_bytes(content)
+            os.replace(temp_path, cache_path)
+            written[cache_path] = content
+        except OSError:
+            # A failed cache write only costs a future cache miss
+            with contextlib.suppress(OSError):
+                temp_path.unlink(missing_ok=True)
+
+    if pending:
+        # Entries stay pending until they are on disk, so a concurrent load finds
+        # them in one place or the other. An entry saved again meanwhile is kept
+        # for the next flush.
+        with _pending_lock:
+            for cache_path, content in pending.items():
+                if _pending_writes.get(cache_path) is content:
+                    del _pending_writes[cache_path]
+            # Replace any remembered contents of the files just written
+            for cache_path, content in written.items():
+                _remember_cache_file(cache_path, content)
+
+
+atexit.register(flush_cache)
+
+
 def save_to_cache(cache_type: str, cache_key: str, data: dict[str, Any]) -> None:
-    """Save data to cache file.
+    """Queue data to be written to a cache file.
+
+    Writes are batched; call `flush_cache` to force pending entries to disk.
 
     Args:
         cache_type: Type of cache (e.g., "translation")
         cache_key: Cache key
         data: Data to cache
     """
+    global _flush_timer
+
     cache_path = get_cache_path(cache_type, cache_key)
+    content = _dump_cache_data(data)
+
+    with _pending_lock:
+        _pending_writes[cache_path] = content
+        should_flush = len(_pending_writes) >= FLUSH_THRESHOLD
+        if not should_flush and _flush_timer is None:
+            _flush_timer = threading.Timer(FLUSH_INTERVAL, flush_cache)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+    if should_flush:
+        flush_cache()
+
+
+def _remember_cache_file(cache_path: Path, content: bytes | None) -> None:
+    """Remember a cache file's contents, evicting the least recently used entry.
+
+    Must be called with _pending_lock held.
+    """
+    _read_cache[cache_path] = content
+    _read_cache.move_to_end(cache_path)
+    if len(_read_cache) > READ_CACHE_SIZE:
+        _read_cache.popitem(last=False)
 
-    # Write to cache file
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def _read_cache_file(cache_path: Path) -> bytes | None:
+    """Read a cache file, remembering the result for the rest of the process.
+
+    The raw bytes are cached rather than the decoded data so that each caller
+    gets its own copy to mutate. Writes update only the entries for the files
+    they replace.
+    """
+    with _pending_lock:
+        if cache_path in _read_cache:
+            _read_cache.move_to_end(cache_path)
+            return _read_cache[cache_path]
+
+    try:
+        content: bytes | None = cache_path.read_bytes()
+    except OSError:
+        content = None
+
+    with _pending_lock:
+        # A flush that finished during the read has already recorded newer contents
+        if cache_path not in _read_cache:
+            _remember_cache_file(cache_path, content)
+    return content
 
 
 def load_from_cache(cache_type: str, cache_key: str) -> dict[str, Any] | None:
@@ -138,16 +366,19 @@ def load_from_cache(cache_type: str, cache_key: str) -> dict[str, Any] | None:
     """
     cache_path = get_cache_path(cache_type, cache_key)
 
-    if not cache_path.exists():
+    # Serve entries that have not been flushed yet
+    with _pending_lock:
+        content = _pending_writes.get(cache_path)
+
+    if content is None:
+        content = _read_cache_file(cache_path)
+    if content is None:
         return None
 
     try:
-        with open(cache_path, encoding="utf-8") as f:
-            cache_data = json.load(f)
-
-        return cache_data
-    except (json.JSONDecodeError, OSError):
-        # If there's an error reading the cache, ignore it
+        return _load_cache_data(content)
+    except ValueError:
+        # If there's an error decoding the cache, ignore it
         return None
 
 
@@ -157,6 +388,7 @@ def cached(
     key_generator: Callable[..., dict[str, Any]] | None = None,
     result_processor: Callable[[Any, dict[str, Any]], Any] | None = None,
     cache_processor: Callable[[Any], dict[str, Any]] | None = None,
+    strict_validate: bool = False,
 ) -> Callable[[Callable[..., R]], Callable[..., R]]:
     """Decorator for caching function results.
 
@@ -166,33 +398,70 @@ def cached(
         key_generator: Optional function to generate additional key parameters
         result_processor: Optional function to process the result with cache data
         cache_processor: Optional function to process the result before caching
+        strict_validate: Fully validate cache data against cache_schema. By default
+            the data is trusted (we wrote it) and only checked for required fields.
 
     Returns:
         Decorated function
     """
 
     def decorator(func: Callable[..., R]) -> Callable[..., R]:
+        # Inspect the signature once per decorated function, not per call
+        sig = inspect.signature(func)
+        positional_names = [
+            p.name
+            for p in sig.parameters.values()
+            if p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        ]
+        defaults = {p.name: p.default for p in sig.parameters.values() if p.default is not inspect.Parameter.empty}
+        keyword_names = frozenset(
+            p.name
+            for p in sig.parameters.values()
+            if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        )
+        required_names = frozenset(sig.parameters) - defaults.keys()
+        # Functions with *args or **kwargs still go through Signature.bind
+        has_varargs = any(
+            p.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD) for p in sig.parameters.values()
+        )
+        schema_fields = cache_schema.model_fields if cache_schema is not None else {}
+        required_fields = {name for name, field in schema_fields.items() if field.is_required()}
+
+        def bind_arguments(args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+            """Map call arguments to parameter names, including defaults.
+
+            Calls the fast path can't map go through Signature.bind, which raises
+            TypeError for invalid arguments before the cache is consulted.
+            """
+            if not has_varargs and len(args) <= len(positional_names):
+                arguments = dict(zip(positional_names, args, strict=False))
+                if kwargs.keys() <= keyword_names and kwargs.keys().isdisjoint(arguments):
+                    arguments = {**defaults, **arguments, **kwargs}
+                    if required_names <= arguments.keys():
+                        return arguments
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return dict(bound.arguments)
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> R:
             # Get the parameters
-            sig = inspect.signature(func)
-            bound = sig.bind(*args, **kwargs)
-            bound.apply_defaults()
+            arguments = bind_arguments(args, kwargs)
 
             # Check if caching is disabled via parameter
-            if "cached" in bound.arguments and bound.arguments["cached"] is False:
+            if arguments.get("cached", True) is False:
                 # Call the original function without caching
                 return func(*args, **kwargs)
 
             # Build cache key parameters from all function arguments
-            cache_key_params = {**bound.arguments}
+            cache_key_params = {**arguments}
 
             # Remove 'cached' flag from cache key parameters if present
             cache_key_params.pop("cached", None)
 
             # Add generated key params if a generator function is provided
             if key_generator:
-                generated_params = key_generator(**bound.arguments)
+                generated_params = key_generator(**arguments)
                 cache_key_params.update(generated_params)
 
             # Compute cache key from all parameters
@@ -205,13 +474,25 @@ def cached(
             if cache_data is not None:
                 # Validate the cache data if a cache schema is provided
                 if cache_schema is not None:
-                    try:
-                        # Validate cache data against the schema
-                        validated_data = cache_schema(**cache_data)
-                        # Convert back to dict
-                        cache_data = validated_data.model_dump()
-                    except ValidationError:
-                        # If validation fails, ignore the cache and call the original function
+                    if strict_validate:
+                        try:
+                            # Validate cache data against the schema
+                            validated_data = cache_schema.model_validate(cache_data)
+                            # Convert back to dict
+                            cache_data = validated_data.model_dump()
+                        except ValidationError:
+                            # If validation fails, ignore the cache and call the original function
+                            cache_data = None
+                    elif required_fields <= cache_data.keys():
+                        # Trusted data: fill in defaults and drop unknown keys without building a model
+                        cache_data = {
+                            name: cache_data[name]
+                            if name in cache_data
+                            else field.get_default(call_default_factory=True)
+                            for name, field in schema_fields.items()
+                        }
+                    else:
+                        # Written by an incompatible schema; treat as a cache miss
                         cache_data = None
 
                 if cache_data is not None:
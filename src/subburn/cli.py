@@ -1,31 +1,49 @@
 """Command-line interface for subburn."""
 
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Annotated, cast
+from typing import TYPE_CHECKING, Annotated
 
 import click
 import typer
 from rich.console import Console
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TaskProgressColumn,
-    TextColumn,
-    TimeRemainingColumn,
-)
-
-from . import image_gen
+
 from .debug import debug_print, set_debug_level
-from .movie import create_movie
-from .transcription import create_srt_from_segments, get_audio_duration, transcribe_audio
+from .srt_parse import read_srt
 from .types import MovieConfig, Segment, SubtitleOptions
-from .utils import collect_input_files, compute_output_path, open_file_with_app
+from .utils import collect_input_files, compute_output_path, open_file_with_app, write_text_if_changed
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
 
 console = Console()
 app = typer.Typer()
 
 
+@contextmanager
+def background_executor(max_workers: int) -> Iterator[tuple["ThreadPoolExecutor", threading.Event]]:
+    """Run background tasks in a thread pool that is abandoned if the caller fails.
+
+    Yields the executor and an event that is set when the body raises. Tasks
+    that make API requests should check the event so that an error or Ctrl-C is
+    reported immediately rather than after they finish.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield executor, stop
+    except BaseException:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+
 @app.command()
 def main(
     files: Annotated[list[Path], typer.Argument(help="Input files")],
@@ -53,6 +71,16 @@ def main(
     original_font_size: Annotated[int, typer.Option(help="Font size for original text")] = 28,
     pinyin_font_size: Annotated[int, typer.Option(help="Font size for pinyin text")] = 22,
     translation_font_size: Annotated[int, typer.Option(help="Font size for translation text")] = 22,
+    hwaccel: Annotated[
+        bool, typer.Option(help="Encode with a hardware H.264 encoder (VideoToolbox, NVENC, QSV) if available")
+    ] = False,
+    temp_dir: Annotated[
+        Path | None, typer.Option(help="Directory for temporary working files", exists=True, file_okay=False)
+    ] = None,
+    cache: Annotated[bool, typer.Option(help="Reuse cached transcriptions, translations and generated images")] = True,
+    compress_upload: Annotated[
+        bool, typer.Option(help="Compress audio to low-bitrate Opus before uploading it to Whisper")
+    ] = False,
     verbose: Annotated[bool, typer.Option("-v", "--verbose", help="Show debug information")] = False,
 ) -> None:
     """Create a video with burnt-in subtitles.
@@ -83,14 +111,32 @@ def main(
         translation_color=translation_color,
     )
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        TimeRemainingColumn(),
-        console=console,
-    ) as progress:
+    # Deferred so that --help and argument errors don't load the progress and movie modules
+    from rich.progress import (
+        BarColumn,
+        Progress,
+        SpinnerColumn,
+        TaskProgressColumn,
+        TextColumn,
+        TimeRemainingColumn,
+    )
+
+    from .media import get_audio_duration
+    from .movie import create_movie
+
+    with (
+        Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            TimeRemainingColumn(),
+            console=console,
+            refresh_per_second=10,
+        ) as progress,
+        # Runs independent I/O-bound steps (ffprobe, image generation) alongside the main thread
+        background_executor(max_workers=2) as (executor, stop_background),
+    ):
         task_id = progress.add_task("Processing", total=100)
 
         # Collect and validate input files
@@ -103,9 +149,9 @@ def main(
             output_path = output or compute_output_path(input_files)
 
         # Prevent overwriting input files
-        if (input_files.audio and output_path.resolve() == input_files.audio.resolve()) or (
-            input_files.video and output_path.resolve() == input_files.video.resolve()
-        ):
+        resolved_output = output_path.resolve()
+        resolved_inputs = {path.resolve() for path in (input_files.audio, input_files.video) if path}
+        if resolved_output in resolved_inputs:
             raise click.UsageError(
                 f"Output file would overwrite input file: {output_path}\n"
                 f"Please specify a different output file using the --output option"
@@ -122,31 +168,55 @@ def main(
         # Initialize variables
         whisper_segments: list[Segment] = []
         image_timestamps: dict[float, Path] = {}
+        duration: float | None = None
+        images_future: Future[dict[float, Path]] | None = None
+
+        def start_image_generation(segments: list[Segment]) -> None:
+            """Generate images in the background while subtitles are translated and written."""
+            nonlocal images_future
+            debug_print("Generating images for {} segments...", len(segments))
+            from . import image_gen
+
+            images_future = executor.submit(
+                image_gen.generate_images_for_segments,
+                segments,
+                image_style,
+                progress,
+                stop=stop_background,
+                cached=cache,
+            )
+
+        # Whisper reports the audio duration; otherwise probe for it while the subtitles are processed
+        duration_future = None
+        if not whisper:
+            duration_future = executor.submit(
+                get_audio_duration,
+                str(input_files.audio or input_files.video),
+                progress,
+                task_id,
+                verbose=verbose,
+            )
 
         if whisper:
             debug_print("Starting transcription...")
             if not input_files.audio:
                 raise click.BadParameter("Cannot transcribe video files yet")
 
-            # Use the subtitle options created at the beginning
-            input_files.subtitle, whisper_segments = transcribe_audio(
-                input_files.audio, progress, task_id, subtitle_options
+            from .transcription import transcribe_audio
+
+            # Use the subtitle options created at the beginning. Images are started as soon as
+            # the segments exist, so that they are generated while the segments are translated.
+            input_files.subtitle, whisper_segments, duration = transcribe_audio(
+                input_files.audio,
+                progress,
+                task_id,
+                subtitle_options,
+                cached=cache,
+                compress_upload=compress_upload,
+                on_segments=start_image_generation if generate_images else None,
             )
             debug_print("Transcription complete. Generated {} segments", len(whisper_segments))
-
-            # Generate images if requested
-            if generate_images:
-                debug_print("Generating images for {} segments...", len(whisper_segments))
-                image_timestamps = image_gen.generate_images_for_segments(
-                    cast(list[image_gen.Segment], whisper_segments),
-                    image_style,
-                    progress,
-                )
-                if image_timestamps:
-                    debug_print("Generated {} images", len(image_timestamps))
-                else:
-                    debug_print("No images were generated")
-            else:
+            if not generate_images:
                 debug_print("Image generation not requested")
         else:
             if not input_files.subtitle:
@@ -157,102 +227,77 @@ def main(
             if generate_images or pinyin or translation:
                 debug_print("Reading existing subtitle file for processing...")
                 try:
-                    with open(input_files.subtitle, encoding="utf-8") as f:
-                        srt_content = f.read()
+                    parsed_segments = read_srt(input_files.subtitle)
                 except OSError as e:
                     raise click.BadParameter(f"Failed to read subtitle file: {e}") from e
+                except ValueError as e:
+                    raise click.BadParameter(f"Failed to parse subtitle file: {e}") from e
 
-                # Parse SRT content into segments
-                parsed_segments: list[Segment] = []
-                current_segment = Segment(
-                    start=0.0,
-                    end=0.0,
-                    text="",
-                )
-                for line in srt_content.strip().split("\n"):
-                    line = line.strip()
-                    if not line:
-                        if current_segment.text:
-                            # Only use the first line of text (the original Chinese)
-                            # This handles cases where the SRT already has pinyin/translation
-                            first_line = current_segment.text.split("\n")[0]
-                            current_segment.text = first_line
-                            parsed_segments.append(current_segment)
-                            current_segment = Segment(
-                                start=0.0,
-                                end=0.0,
-                                text="",
-                            )
-                        continue
-                    if "-->" in line:
-                        start, end = line.split("-->")
-                        start = start.strip().replace(",", ".")
-                        end = end.strip().replace(",", ".")
-                        current_segment.start = (
-                            float(start.split(":")[0]) * 3600
-                            + float(start.split(":")[1]) * 60
-                            + float(start.split(":")[2])
-                        )
-                        current_segment.end = (
-                            float(end.split(":")[0]) * 3600 + float(end.split(":")[1]) * 60 + float(end.split(":")[2])
-                        )
-                    elif not line.isdigit():  # Skip segment numbers
-                        # Accumulate all text lines (handles multi-line subtitles)
-                        if current_segment.text:
-                            current_segment.text += "\n" + line
-                        else:
-                            current_segment.text = line
-                if current_segment.text:
-                    # Only use the first line of text (the original Chinese)
-                    # This handles cases where the SRT already has pinyin/translation
-                    first_line = current_segment.text.split("\n")[0]
-                    current_segment.text = first_line
-                    parsed_segments.append(current_segment)
-
-                # Add translations if requested
-                if translation and parsed_segments:
-                    progress.update(task_id, description="Translating segments", advance=10)
-                    from .translation import translate_segments
-
-                    # Get segments with translations (cached or newly translated)
-                    parsed_segments = translate_segments(parsed_segments)
-
-                # Regenerate SRT with styling options if requested
-                if pinyin or translation:
-                    srt_content = create_srt_from_segments(parsed_segments, options=subtitle_options)
-                    with open(input_files.subtitle, "w", encoding="utf-8") as f:
-                        f.write(srt_content)
-                    debug_print("Updated subtitle file with pinyin/translation")
-
-                # Generate images if requested
-                if generate_images and parsed_segments:
-                    debug_print("Found {} segments in subtitle file", len(parsed_segments))
-                    debug_print("Generating images...")
-                    image_timestamps = image_gen.generate_images_for_segments(
-                        cast(list[image_gen.Segment], parsed_segments),
-                        image_style,
-                        progress,
-                    )
-                    if image_timestamps:
-                        debug_print("Generated {} images", len(image_timestamps))
-                    else:
-                        debug_print("No images were generated")
-                elif generate_images:
+                # Nothing to translate, annotate or illustrate; in particular, don't
+                # replace a subtitle file we couldn't parse with an empty one
+                if not parsed_segments:
                     debug_print("No segments found in subtitle file")
+                else:
+                    # Translation and image generation are independent API-bound tasks, so
+                    # generate images in the background while translating
+                    debug_print("Found {} segments in subtitle file", len(parsed_segments))
+                    if generate_images:
+                        start_image_generation(parsed_segments)
+
+                    # Add translations if requested
+                    if translation:
+                        progress.update(task_id, description="Translating segments", advance=10)
+                        from .translation import translate_segments
+
+                        # Get segments with translations (cached or newly translated)
+                        parsed_segments = translate_segments(parsed_segments, cached=cache)
+
+                    # Regenerate SRT with styling options if requested
+                    if pinyin or translation:
+                        from .transcription import create_srt_from_segments
+
+                        srt_content = create_srt_from_segments(parsed_segments, options=subtitle_options)
+                        if write_text_if_changed(input_files.subtitle, srt_content):
+                            debug_print("Updated subtitle file with pinyin/translation")
+                        else:
+                            debug_print("Subtitle file already has pinyin/translation")
+
+        if images_future:
+            image_timestamps = images_future.result()
+            if image_timestamps:
+                debug_print("Generated {} images", len(image_timestamps))
+            else:
+                debug_print("No images were generated")
 
         if not input_files.subtitle:
             raise click.BadParameter("No subtitle file found or created")
 
         # Get audio duration for background generation
-        duration = get_audio_duration(
-            str(input_files.audio or input_files.video),
-            progress,
-            task_id,
-            verbose=verbose,
-        )
+        if duration_future:
+            duration = duration_future.result()
+        elif duration is None:
+            duration = get_audio_duration(
+                str(input_files.audio or input_files.video),
+                progress,
+                task_id,
+                verbose=verbose,
+            )
 
         # Create movie config using the subtitle options created earlier
-        movie_config = MovieConfig(subtitle_options=subtitle_options, width=width, height=height)
+        movie_config = MovieConfig(
+            subtitle_options=subtitle_options,
+            width=width,
+            height=height,
+            video_encoder="auto" if hwaccel else "libx264",
+            temp_dir=temp_dir,
+        )
+
+        # Persist any batched cache entries before the long-running encode. The cache
+        # module is only loaded once something has used it.
+        if f"{__package__}.cache" in sys.modules:
+            from .cache import flush_cache
+
+            flush_cache()
 
         # Create the movie
         create_movie(
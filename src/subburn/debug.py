@@ -12,6 +12,14 @@ def set_debug_level(level: int) -> None:
     DEBUG_LEVEL = level
 
 
+def debug_enabled(level: int = 1) -> bool:
+    """Return whether debug messages at the given level are printed.
+
+    Use this to skip building expensive debug output that would be discarded.
+    """
+    return level <= DEBUG_LEVEL
+
+
 def debug_print(message: str, *args: Any, level: int = 1) -> None:
     """Print debug messages if debug level is high enough.
 
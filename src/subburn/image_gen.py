@@ -1,23 +1,34 @@
 """Generate images for video segments."""
 
+import contextlib
 import os
-import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import httpx
-from openai import OpenAI, OpenAIError
+from openai import OpenAIError
 from rich.progress import Progress
 
+from .cache import compute_cache_key, ensure_cache_dir
 from .debug import debug_print
+from .openai_client import get_openai_client
 from .rate_limit import (
     INITIAL_RETRY_DELAY,
+    MAX_CONCURRENT_REQUESTS,
     MAX_RETRIES,
     RATE_LIMIT,
     RateLimiter,
 )
 from .types import OpenAIKeyException, Segment
 
+IMAGE_MODEL = "dall-e-3"
+IMAGE_SIZE = "1024x1024"
+IMAGE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Number of generated images kept in the cache; the least recently used are deleted beyond this
+MAX_CACHED_IMAGES = 1000
+
 
 def check_openai_api_key() -> str:
     """Check if OpenAI API key is set and valid."""
@@ -31,48 +42,79 @@ def generate_image(
     text: str,
     style_prompt: str,
     output_dir: Path,
-    segment_index: int,
-) -> tuple[float, Path | None]:
-    """Generate an image for the given text using DALL-E."""
-    api_key = check_openai_api_key()
-    client = OpenAI(api_key=api_key)
+    rate_limiter: RateLimiter | None = None,
+    stop: threading.Event | None = None,
+    cached: bool = True,
+) -> Path | None:
+    """Generate an image for the given text using DALL-E.
+
+    Images are named by a hash of their prompt and model settings, so an image
+    that already exists in output_dir is reused instead of generated again,
+    unless cached is false. The rate limiter, if given, is only consulted before
+    an API request. If stop is set, no further request is made.
+
+    Returns the path of the image, or None if it couldn't be generated.
+    """
+    # Combine text with style prompt
+    prompt = f"{text} - {style_prompt}"
+
+    image_path = output_dir / f"{compute_cache_key(prompt=prompt, model=IMAGE_MODEL, size=IMAGE_SIZE)}.png"
+    if cached and image_path.exists():
+        # Mark the image as recently used so that pruning keeps it
+        with contextlib.suppress(OSError):
+            os.utime(image_path)
+        return image_path
+
+    if stop is not None and stop.is_set():
+        return None
+    if rate_limiter:
+        rate_limiter.wait(stop)
+        if stop is not None and stop.is_set():
+            return None
+
+    check_openai_api_key()
+    client = get_openai_client()
 
     retry_delay = INITIAL_RETRY_DELAY
 
     for attempt in range(MAX_RETRIES):
         try:
-            # Combine text with style prompt
-            prompt = f"{text} - {style_prompt}"
-
             # Generate image
             response = client.images.generate(
-                model="dall-e-3",
+                model=IMAGE_MODEL,
                 prompt=prompt,
-                size="1024x1024",
+                size=IMAGE_SIZE,
                 quality="standard",
                 n=1,
             )
 
             # Check if response has data
             if not response.data or len(response.data) == 0:
-                return 0, None
+                return None
 
             # Get image URL
             image_url = response.data[0].url
             if image_url is None:
-                return 0, None
-
-            # Download image
-            image_response = httpx.get(image_url)
-            if image_response.status_code != 200:
-                debug_print("Failed to download image: {}", image_response.status_code)
-                return 0, None
-
-            # Save image
-            image_path = output_dir / f"image_{segment_index:04d}.png"
-            image_path.write_bytes(image_response.content)
-
-            return 0, image_path
+                return None
+
+            # Download image, streaming it to disk; write and rename so that an
+            # interrupted download isn't reused. The temporary name is unique to
+            # this thread, since another worker may be writing the same image.
+            temp_path = image_path.with_name(f"{image_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with httpx.stream("GET", image_url) as image_response:
+                    if image_response.status_code != 200:
+                        debug_print("Failed to download image: {}", image_response.status_code)
+                        return None
+                    with open(temp_path, "wb") as f:
+                        for chunk in image_response.iter_bytes(IMAGE_DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                os.replace(temp_path, image_path)
+            finally:
+                with contextlib.suppress(OSError):
+                    temp_path.unlink(missing_ok=True)
+
+            return image_path
 
         except OpenAIError as e:
             debug_print("OpenAI API error: {}", e)
@@ -80,26 +122,34 @@ def generate_image(
                 time.sleep(retry_delay)
                 retry_delay *= 2
             else:
-                return 0, None
+                return None
 
         except Exception as e:
             debug_print("Error generating image: {}", e)
-            return 0, None
+            return None
 
-    return 0, None
+    return None
 
 
 def generate_images_for_segments(
     segments: list[Segment],
     style_prompt: str,
     progress: Progress,
+    stop: threading.Event | None = None,
+    cached: bool = True,
 ) -> dict[float, Path]:
-    """Generate images for each segment of text."""
+    """Generate images for each segment of text.
+
+    Segments with the same text share one image, which is requested once. With
+    cached false, images are generated again even if they are in the cache.
+    Setting stop skips the requests that haven't been made yet, for example
+    when the caller is interrupted.
+    """
     # Early check for API key to fail fast
     check_openai_api_key()
 
-    # Create a permanent directory for images
-    output_dir = Path(tempfile.gettempdir()) / "subburn_images"
+    # Keep images in the cache directory so that later runs can reuse them
+    output_dir = ensure_cache_dir() / "images"
     output_dir.mkdir(exist_ok=True)
 
     # Initialize rate limiter
@@ -108,21 +158,49 @@ def generate_images_for_segments(
     # Create progress bar
     task_id = progress.add_task("Generating images", total=len(segments))
 
-    # Generate images for each segment
-    image_timestamps: dict[float, Path] = {}
-    for i, segment in enumerate(segments):
-        rate_limiter.wait()
-
-        timestamp, image_path = generate_image(
-            segment.text,
-            style_prompt,
-            output_dir,
-            i,
-        )
+    # The prompt only depends on the text, so each distinct text needs one image
+    starts_by_text: dict[str, list[float]] = {}
+    for segment in segments:
+        starts_by_text.setdefault(segment.text, []).append(segment.start)
 
-        if image_path:
-            image_timestamps[segment.start] = image_path
+    # Generate images concurrently; requests are dominated by network latency
+    image_timestamps: dict[float, Path] = {}
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        futures = {
+            executor.submit(generate_image, text, style_prompt, output_dir, rate_limiter, stop, cached): starts
+            for text, starts in starts_by_text.items()
+        }
+        for future in as_completed(futures):
+            image_path = future.result()
+            starts = futures[future]
+
+            if image_path:
+                for start in starts:
+                    image_timestamps[start] = image_path
+
+            progress.update(task_id, advance=len(starts))
+
+    prune_image_cache(output_dir, keep=set(image_timestamps.values()))
+    return image_timestamps
 
-        progress.update(task_id, advance=1)
 
-    return image_timestamps
+def prune_image_cache(output_dir: Path, keep: set[Path]) -> None:
+    """Delete the least recently used images beyond MAX_CACHED_IMAGES.
+
+    Images are ordered by modification time, which generate_image updates when
+    it reuses an image. Images in keep are never deleted.
+    """
+    images: list[tuple[float, Path]] = []
+    for path in output_dir.glob("*.png"):
+        with contextlib.suppress(OSError):
+            images.append((path.stat().st_mtime, path))
+
+    excess = len(images) - MAX_CACHED_IMAGES
+    for _mtime, path in sorted(images):
+        if excess <= 0:
+            break
+        if path in keep:
+            continue
+        with contextlib.suppress(OSError):
+            path.unlink()
+        excess -= 1
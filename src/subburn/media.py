@@ -0,0 +1,112 @@
+"""Audio helpers that run ffmpeg and ffprobe."""
+
+import os
+import subprocess
+from pathlib import Path
+
+import click
+from rich.progress import Progress, TaskID
+
+# Opus bitrate for audio uploaded to Whisper with --compress-upload
+UPLOAD_AUDIO_BITRATE = "16k"
+
+
+def compress_audio_for_upload(audio_path: Path, output_path: Path) -> None:
+    """Re-encode audio as low-bitrate mono Opus for uploading to Whisper.
+
+    Speech transcribes just as well at this bitrate, and the file is typically
+    about a tenth the size of the original.
+
+    Args:
+        audio_path: Path to the audio/video file
+        output_path: Path of the Ogg file to write
+    """
+    try:
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-v",
+                "error",
+                "-i",
+                str(audio_path),
+                "-vn",  # Drop any video or cover art
+                "-map_metadata",
+                "-1",
+                "-ac",
+                "1",
+                "-ar",
+                "16000",
+                "-c:a",
+                "libopus",
+                "-b:a",
+                UPLOAD_AUDIO_BITRATE,
+                str(output_path),
+            ],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        detail = getattr(e, "stderr", None) or e
+        raise click.ClickException(f"Failed to compress audio for upload: {str(detail).strip()}") from e
+
+
+def get_audio_duration(file_path: str, progress: Progress, task_id: TaskID, verbose: bool = False) -> float:
+    """Get duration of audio/video file using ffprobe.
+
+    Durations are cached by file path, size and modification time, so ffprobe
+    only runs again for a new or changed file.
+
+    Args:
+        file_path: Path to the audio/video file
+        progress: Progress bar object for displaying progress
+        task_id: ID of the progress bar task
+        verbose: Whether to print detailed ffprobe output
+
+    Returns:
+        Duration of the audio/video file in seconds
+    """
+    progress.update(task_id, description="Getting audio duration")
+
+    from .cache import compute_cache_key, load_from_cache, save_to_cache
+
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        cache_key = None
+    else:
+        cache_key = compute_cache_key(path=os.path.abspath(file_path), size=stat.st_size, mtime=stat.st_mtime_ns)
+        cached = load_from_cache("duration", cache_key)
+        if cached is not None:
+            progress.update(task_id, advance=5)
+            return cached["duration"]
+
+    # Set verbosity level for ffprobe
+    verbosity = "info" if verbose else "error"
+
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                verbosity,  # Use verbosity level based on verbose flag
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                file_path,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        duration = float(result.stdout.strip())
+        if cache_key is not None:
+            save_to_cache("duration", cache_key, {"duration": duration})
+        progress.update(task_id, advance=5)
+        return duration
+    except (subprocess.CalledProcessError, ValueError) as e:
+        raise click.ClickException(f"Failed to get audio duration: {e}") from e
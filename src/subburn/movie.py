@@ -1,7 +1,14 @@
 """Video creation and subtitle rendering."""
 
+import functools
+import os
+import re
+import shutil
 import subprocess
+import sys
 import tempfile
+import time
+from collections import deque
 from pathlib import Path
 
 import click
@@ -10,6 +17,48 @@ from rich.progress import Progress, TaskID
 from .types import MovieConfig, SubtitleOptions
 from .utils import escape_path, find_cjk_compatible_font
 
+# Number of trailing ffmpeg stderr lines included in error messages
+FFMPEG_ERROR_LINES = 20
+# Size of each read from the ffmpeg stderr pipe
+FFMPEG_READ_SIZE = 65536
+# tmpfs mount for working files on Linux
+RAM_SCRATCH_ROOT = "/dev/shm"
+# Seconds to wait for ffmpeg to exit after an interrupt before killing it
+FFMPEG_STOP_TIMEOUT = 5
+# Minimum seconds between progress updates while ffmpeg runs
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+SOFTWARE_H264_ENCODER = "libx264"
+# Hardware H.264 encoders, in order of preference
+HARDWARE_H264_ENCODERS = ("h264_videotoolbox", "h264_nvenc", "h264_qsv")
+
+# Filter graph for image sequence backgrounds: scale and pad the images to the
+# output dimensions, then add subtitles
+IMAGE_SEQUENCE_FILTER = (
+    "[0:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+    "pad={width}:{height}:(ow-iw)/2:(oh-ih)/2[bg],"
+    "[bg]{subtitles}[v]"
+)
+
+# Keys written by "ffmpeg -progress", apart from the per-stream "stream_N_N_q" entries
+FFMPEG_PROGRESS_KEYS = frozenset(
+    {
+        b"frame",
+        b"fps",
+        b"bitrate",
+        b"total_size",
+        b"out_time_us",
+        b"out_time_ms",
+        b"out_time",
+        b"dup_frames",
+        b"drop_frames",
+        b"speed",
+        b"progress",
+    }
+)
+FFMPEG_LINE_SPLIT_RE = re.compile(rb"[\r\n]")
+FFMPEG_TIME_RE = re.compile(rb"time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
 
 def create_subtitles_filter(subtitle_path: Path, options: SubtitleOptions) -> str:
     """Create properly formatted FFmpeg subtitles filter string.
@@ -39,7 +88,22 @@ def create_subtitles_filter(subtitle_path: Path, options: SubtitleOptions) -> st
     return f"subtitles={escaped_path}:force_style='{style_str}'"
 
 
-def run_ffmpeg_with_progress(cmd: list[str | Path], progress: Progress, task_id: TaskID, verbose: bool = False) -> None:
+def _parse_ffmpeg_time(line: bytes) -> float | None:
+    """Extract the elapsed output time in seconds from an ffmpeg status line."""
+    match = FFMPEG_TIME_RE.search(line)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def run_ffmpeg_with_progress(
+    cmd: list[str],
+    progress: Progress,
+    task_id: TaskID,
+    verbose: bool = False,
+    duration: float | None = None,
+) -> None:
     """Run ffmpeg command with progress tracking.
 
     Args:
@@ -47,6 +111,7 @@ def run_ffmpeg_with_progress(cmd: list[str | Path], progress: Progress, task_id:
         progress: Progress object for tracking
         task_id: Task ID for progress tracking
         verbose: Whether to print FFmpeg output to console
+        duration: Expected output duration in seconds, used to report progress as a percentage
     """
     progress.update(task_id, description="Processing video")
 
@@ -54,60 +119,235 @@ def run_ffmpeg_with_progress(cmd: list[str | Path], progress: Progress, task_id:
     stderr_pipe = None if verbose else subprocess.PIPE
 
     process = subprocess.Popen(
-        [str(x) for x in cmd],  # Convert all arguments to strings
-        stdout=subprocess.PIPE,  # Always capture stdout
+        cmd,
+        stdin=subprocess.DEVNULL,  # Keep ffmpeg from reading interactive commands from the terminal
+        stdout=subprocess.DEVNULL,  # ffmpeg writes the movie to a file; nothing useful goes to stdout
         stderr=stderr_pipe,  # Only pipe stderr if not verbose
-        universal_newlines=True,
+        close_fds=False,  # Python's own fds are non-inheritable; skip closing every fd before exec
+        start_new_session=True,
     )
 
-    # Collect stderr output
-    stderr_output = []
-
-    # Only process stderr if we're piping it (not verbose mode)
-    if not verbose and process.stderr:
-        while True:
-            if not process.stderr:
-                break
-
-            line = process.stderr.readline()
-            if not line:
-                break
+    # Keep the tail of stderr for error reporting
+    stderr_output: deque[bytes] = deque(maxlen=FFMPEG_ERROR_LINES)
+
+    try:
+        # Only process stderr if we're piping it (not verbose mode)
+        if not verbose and process.stderr:
+            fd = process.stderr.fileno()
+            buffer = b""
+            last_elapsed = -1.0
+            last_update = float("-inf")
+            while True:
+                # Read whatever is available in large chunks rather than line by line
+                chunk = os.read(fd, FFMPEG_READ_SIZE)
+                if not chunk:
+                    break
+
+                # ffmpeg terminates status lines with \r and log lines with \n
+                lines = FFMPEG_LINE_SPLIT_RE.split(buffer + chunk)
+                buffer = lines.pop()
+
+                for line in lines:
+                    if not line:
+                        continue
+
+                    key, sep, value = line.partition(b"=")
+                    if sep and (key in FFMPEG_PROGRESS_KEYS or key.startswith(b"stream_")) and b" " not in line:
+                        # A "-progress" report line; only the output time is used
+                        if key != b"out_time_us" or not value.isdigit():
+                            continue
+                        elapsed = int(value) / 1_000_000
+                    else:
+                        # Store stderr output for error reporting
+                        stderr_output.append(line)
+                        elapsed = _parse_ffmpeg_time(line)
+
+                    # Update progress only when ffmpeg reports a later output time, and
+                    # no more often than the display refreshes
+                    if elapsed is None or elapsed <= last_elapsed:
+                        continue
+                    now = time.monotonic()
+                    if now - last_update < PROGRESS_UPDATE_INTERVAL:
+                        continue
+                    last_elapsed = elapsed
+                    last_update = now
+                    if duration:
+                        # Leave the bar short of 100% until ffmpeg has actually finished
+                        progress.update(task_id, completed=min(99.0, 100.0 * elapsed / duration))
+                    else:
+                        progress.update(task_id, advance=1)
+
+            if buffer:
+                stderr_output.append(buffer)
+
+        exit_code = process.wait()
+    except BaseException:
+        # ffmpeg runs in its own session and won't see the terminal's Ctrl-C. Ask it
+        # to stop, and kill it if it doesn't exit promptly.
+        process.terminate()
+        try:
+            process.wait(timeout=FFMPEG_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        raise
 
-            # Store stderr output for error reporting
-            stderr_output.append(line)
-
-            # Update progress based on ffmpeg output
-            if "time=" in line:
-                progress.update(task_id, advance=1)
-
-    exit_code = process.wait()
     if exit_code != 0:
         # Format the error output for readability, focusing on the most relevant parts
-        if stderr_output:
-            error_msg = "\n".join(stderr_output[-20:])  # Show the last 20 lines which usually contain the error
-        else:
-            error_msg = "FFmpeg error output not captured in verbose mode."
+        # (the last lines usually contain the error)
+        error_msg = (
+            b"\n".join(stderr_output).decode("utf-8", errors="replace")
+            if stderr_output
+            else "FFmpeg error output not captured in verbose mode."
+        )
         raise click.ClickException(f"FFmpeg processing failed with exit code {exit_code}:\n\n{error_msg}")
 
     progress.update(task_id, description="Video processing complete", completed=100)
 
 
+@functools.cache
+def detect_h264_encoder() -> str:
+    """Find a working hardware H.264 encoder, falling back to libx264.
+
+    A hardware encoder that works is cached on disk for the installed ffmpeg
+    binary, so the probe only runs again after ffmpeg is replaced or upgraded.
+    Falling back to libx264 is not cached: the failure may be transient, or fixed
+    by a driver or hardware change that leaves ffmpeg alone.
+    """
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
+        return SOFTWARE_H264_ENCODER
+
+    from .cache import compute_cache_key, load_from_cache, save_to_cache
+
+    try:
+        stat = os.stat(ffmpeg_path)
+    except OSError:
+        return _probe_h264_encoder()
+    cache_key = compute_cache_key(ffmpeg=ffmpeg_path, size=stat.st_size, mtime=stat.st_mtime_ns)
+    cached = load_from_cache("encoder", cache_key)
+    if cached is not None:
+        return cached["encoder"]
+
+    encoder = _probe_h264_encoder()
+    if encoder != SOFTWARE_H264_ENCODER:
+        save_to_cache("encoder", cache_key, {"encoder": encoder})
+    return encoder
+
+
+def _probe_h264_encoder() -> str:
+    """Find a working hardware H.264 encoder by running ffmpeg.
+
+    Each candidate that ffmpeg lists is checked with a tiny test encode, since
+    an encoder can be compiled in without the hardware or driver to run it.
+    """
+    from .debug import debug_print
+
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True, check=True)
+    except (FileNotFoundError, subprocess.SubprocessError):
+        return SOFTWARE_H264_ENCODER
+
+    for encoder in HARDWARE_H264_ENCODERS:
+        if encoder not in result.stdout:
+            continue
+        try:
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-hide_banner",
+                    "-v",
+                    "error",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "color=c=black:s=256x256:d=0.1",
+                    "-c:v",
+                    encoder,
+                    "-f",
+                    "null",
+                    "-",
+                ],
+                capture_output=True,
+                check=True,
+            )
+        except subprocess.SubprocessError:
+            debug_print("Hardware encoder {} is listed but not usable", encoder)
+            continue
+        debug_print("Using hardware encoder {}", encoder)
+        return encoder
+
+    return SOFTWARE_H264_ENCODER
+
+
+def video_encoder_args(config: MovieConfig) -> list[str]:
+    """Build the ffmpeg video encoder options for a movie configuration.
+
+    Args:
+        config: Movie configuration
+
+    Returns:
+        FFmpeg arguments selecting and tuning the H.264 encoder
+    """
+    encoder = detect_h264_encoder() if config.video_encoder == "auto" else config.video_encoder
+    quality = str(config.crf)
+
+    if encoder == "h264_videotoolbox":
+        # VideoToolbox has no constant-quality mode on all Macs; use a bitrate target
+        return ["-c:v", encoder, "-b:v", "2M", "-allow_sw", "1", "-profile:v", "high"]
+    if encoder == "h264_nvenc":
+        return ["-c:v", encoder, "-preset", "p4", "-rc", "vbr", "-cq", quality, "-profile:v", "high"]
+    if encoder == "h264_qsv":
+        return ["-c:v", encoder, "-global_quality", quality, "-profile:v", "high"]
+
+    return [
+        "-c:v",
+        encoder,
+        "-preset",
+        config.video_quality,  # Balance between encoding speed and quality
+        "-tune",
+        "stillimage",  # The background is a still image, slideshow, or solid color
+        "-crf",
+        quality,  # Reasonable quality setting
+        "-profile:v",
+        "high",  # High profile for better quality
+        "-level:v",
+        "4.0",  # Compatible level for most devices
+        "-threads",
+        "0",  # Let x264 pick the thread count
+    ]
+
+
+def get_scratch_root() -> str | None:
+    """Return a RAM-backed directory for short-lived working files, if there is one.
+
+    Returns:
+        Path to use as the parent of temporary directories, or None for the system default
+    """
+    if sys.platform == "linux" and os.path.isdir(RAM_SCRATCH_ROOT) and os.access(RAM_SCRATCH_ROOT, os.W_OK):
+        return RAM_SCRATCH_ROOT
+    return None
+
+
 def create_image_list_file(image_timestamps: dict[float, Path], temp_dir: Path) -> Path:
     """Create a file listing images and their durations for ffmpeg concat."""
-    from .debug import debug_print
+    from .debug import debug_enabled, debug_print
 
     image_list_path = temp_dir / "image_list.txt"
-    timestamps = sorted(image_timestamps.keys())
+    pairs = sorted(image_timestamps.items())
+    show_entries = debug_enabled()
 
-    with open(image_list_path, "w") as f:
-        for i, start in enumerate(timestamps):
-            image_path = image_timestamps[start]
-            duration = timestamps[i + 1] - start if i < len(timestamps) - 1 else 5.0
+    entries = []
+    for i, (start, image_path) in enumerate(pairs):
+        duration = pairs[i + 1][0] - start if i < len(pairs) - 1 else 5.0
 
-            f.write(f"file '{image_path}'\n")
-            f.write(f"duration {duration}\n")
+        entries.append(f"file '{image_path}'\nduration {duration}\n")
+        if show_entries:
             debug_print("Image {}: {} (duration: {:.2f}s)", i, image_path, duration)
 
+    # Write the whole list in one call
+    image_list_path.write_text("".join(entries))
+
     return image_list_path
 
 
@@ -133,14 +373,23 @@ def create_movie(
         task_id: Task ID for progress tracking
         verbose: Whether to print verbose FFmpeg output
     """
-    from .debug import debug_print
+    from .debug import debug_enabled, debug_print
 
     # Create temporary directory for working files
-    with tempfile.TemporaryDirectory() as temp_dir:
+    scratch_root = str(config.temp_dir) if config.temp_dir else get_scratch_root()
+    debug_print("Using scratch directory under {}", scratch_root or tempfile.gettempdir())
+    with tempfile.TemporaryDirectory(dir=scratch_root) as temp_dir:
         temp_path = Path(temp_dir)
 
         # Build ffmpeg command
-        cmd: list[str | Path] = ["ffmpeg", "-y"]
+        cmd: list[str] = ["ffmpeg", "-y"]
+        if progress is not None and task_id is not None and not verbose:
+            # Report progress as key=value lines on stderr instead of the interactive status line
+            cmd.extend(["-progress", "pipe:2", "-nostats"])
+
+        # Shared by all background variants
+        audio_input = str(input_files.audio or input_files.video)
+        subtitles_filter = create_subtitles_filter(input_files.subtitle, config.subtitle_options)
 
         # Add background (color, image sequence, or image)
         if image_timestamps and len(image_timestamps) > 0:
@@ -157,22 +406,13 @@ def create_movie(
                 ]
             )
             # Add audio input
-            cmd.extend(["-i", str(input_files.audio or input_files.video)])
-
-            # Set up filter complex for image sequence
-            filter_complex = [
-                # Scale and pad images to match output dimensions
-                f"[0:v]scale={config.width}:{config.height}:force_original_aspect_ratio=decrease",
-                f"pad={config.width}:{config.height}:(ow-iw)/2:(oh-ih)/2[bg]",
-                # Add subtitles
-                f"[bg]{create_subtitles_filter(input_files.subtitle, config.subtitle_options)}[v]",
-            ]
+            cmd.extend(["-i", audio_input])
 
             # Add filter complex and mapping
             cmd.extend(
                 [
                     "-filter_complex",
-                    ",".join(filter_complex),
+                    IMAGE_SEQUENCE_FILTER.format(width=config.width, height=config.height, subtitles=subtitles_filter),
                     "-map",
                     "[v]",
                     "-map",
@@ -181,13 +421,8 @@ def create_movie(
             )
         elif input_files.image:
             cmd.extend(["-i", str(input_files.image)])
-            cmd.extend(["-i", str(input_files.audio or input_files.video)])
-            cmd.extend(
-                [
-                    "-vf",
-                    create_subtitles_filter(input_files.subtitle, config.subtitle_options),
-                ]
-            )
+            cmd.extend(["-i", audio_input])
+            cmd.extend(["-vf", subtitles_filter])
         else:
             cmd.extend(
                 [
@@ -196,25 +431,16 @@ def create_movie(
                     "-i",
                     f"color=c=black:s={config.width}x{config.height}:r=25:d={audio_duration}",
                     "-i",
-                    str(input_files.audio or input_files.video),
+                    audio_input,
                     "-vf",
-                    create_subtitles_filter(input_files.subtitle, config.subtitle_options),
+                    subtitles_filter,
                 ]
             )
 
         # Add output options
+        cmd.extend(video_encoder_args(config))
         cmd.extend(
             [
-                "-c:v",
-                "libx264",
-                "-preset",
-                config.video_quality,  # Balance between encoding speed and quality
-                "-crf",
-                str(config.crf),  # Reasonable quality setting
-                "-profile:v",
-                "high",  # High profile for better quality
-                "-level:v",
-                "4.0",  # Compatible level for most devices
                 "-pix_fmt",
                 "yuv420p",  # Required for QuickTime compatibility
                 "-movflags",
@@ -229,13 +455,15 @@ def create_movie(
         )
 
         # Print the full command for debugging
-        debug_print("\nFFmpeg command:")
-        debug_print("{}", " ".join(str(x) for x in cmd))
+        if debug_enabled():
+            debug_print("\nFFmpeg command:")
+            debug_print("{}", " ".join(cmd))
 
         # Run ffmpeg
-        if progress and task_id:
-            run_ffmpeg_with_progress(cmd, progress, task_id, verbose=verbose)
+        # TaskID(0), the first task of a Progress, is falsy
+        if progress is not None and task_id is not None:
+            run_ffmpeg_with_progress(cmd, progress, task_id, verbose=verbose, duration=audio_duration)
         else:
             # Use subprocess.DEVNULL to suppress output unless verbose is enabled
             stdout = stderr = None if verbose else subprocess.DEVNULL
-            subprocess.run([str(x) for x in cmd], stdout=stdout, stderr=stderr, check=True)
+            subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=stdout, stderr=stderr, check=True)
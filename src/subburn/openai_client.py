@@ -0,0 +1,17 @@
+"""Shared OpenAI API client."""
+
+import functools
+
+import openai
+
+
+@functools.cache
+def get_openai_client() -> openai.OpenAI:
+    """Return a process-wide OpenAI client.
+
+    Reusing one client lets transcription, translation, and image generation share its
+    HTTP connection pool instead of opening a new TLS connection for every request.
+    The client reads ``OPENAI_API_KEY`` from the environment; callers check for it first
+    so that a missing key is reported for the feature that needs it.
+    """
+    return openai.OpenAI()
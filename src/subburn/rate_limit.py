@@ -1,33 +1,53 @@
 """Rate limiting utilities."""
 
+import threading
 import time
+from collections import deque
 
 # OpenAI rate limit is 7 images per minute
 RATE_LIMIT = 7
 INITIAL_RETRY_DELAY = 1
 MAX_RETRIES = 3
+# Number of image requests allowed in flight at once
+MAX_CONCURRENT_REQUESTS = 4
 
 
 class RateLimiter:
-    """Rate limiter for API requests."""
+    """Rate limiter for API requests.
+
+    Safe to share between threads; callers queue up behind one another.
+    """
 
     def __init__(self, requests_per_minute: int):
         self.requests_per_minute = requests_per_minute
-        self.requests: list[float] = []
+        # Monotonic start times of the requests made in the last minute, oldest first
+        self.requests: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def wait(self, stop: threading.Event | None = None) -> None:
+        """Wait if necessary to stay within rate limits.
+
+        If stop is set while waiting, return early without recording a request.
+        """
+        with self._lock:
+            self._wait(stop)
 
-    def wait(self) -> None:
-        """Wait if necessary to stay within rate limits."""
-        now = time.time()
+    def _wait(self, stop: threading.Event | None) -> None:
+        now = time.monotonic()
         minute_ago = now - 60
 
         # Remove requests older than 1 minute
-        self.requests = [t for t in self.requests if t > minute_ago]
+        while self.requests and self.requests[0] <= minute_ago:
+            self.requests.popleft()
 
         # If at rate limit, wait until oldest request is more than a minute old
         if len(self.requests) >= self.requests_per_minute:
-            wait_time = self.requests[0] - minute_ago
-            if wait_time > 0:
-                time.sleep(wait_time)
-            self.requests = self.requests[1:]
+            delay = self.requests[0] - minute_ago
+            if stop is None:
+                time.sleep(delay)
+            elif stop.wait(delay):
+                return
+            self.requests.popleft()
+            now = time.monotonic()
 
         self.requests.append(now)
@@ -0,0 +1,126 @@
+"""SRT subtitle parsing."""
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from .types import Segment
+
+# Read buffer for SRT files; large enough that most files take a single read
+SRT_READ_BUFFER_SIZE = 1 << 20
+
+# Matches an SRT timestamp such as "00:01:02,500" (a "." separator is also accepted)
+TIMESTAMP_PATTERN = r"(\d+):(\d+):(\d+)(?:[,.](\d+))?"
+TIMESTAMP_RE = re.compile(TIMESTAMP_PATTERN)
+
+
+def _to_seconds(hours: str, minutes: str, seconds: str, fraction: str | None) -> float:
+    """Convert matched timestamp groups to seconds."""
+    result = int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+    if fraction:
+        return result + int(fraction) / 10 ** len(fraction)
+    return float(result)
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """Convert an SRT timestamp to seconds.
+
+    Args:
+        timestamp: Timestamp in "HH:MM:SS,mmm" format
+
+    Returns:
+        Time in seconds
+
+    Raises:
+        ValueError: If the timestamp is malformed
+    """
+    match = TIMESTAMP_RE.fullmatch(timestamp.strip())
+    if not match:
+        raise ValueError(f"Invalid SRT timestamp: {timestamp!r}")
+    return _to_seconds(*match.groups())
+
+
+def _parse_timecode(timestamp: str) -> float:
+    """Convert an SRT timestamp to seconds, reading "HH:MM:SS,mmm" by fixed offsets.
+
+    Timestamps in any other shape are handled by parse_timestamp.
+    """
+    if len(timestamp) == 12 and timestamp[2] == ":" and timestamp[5] == ":" and timestamp[8] in ",.":
+        hours, minutes, seconds, millis = timestamp[0:2], timestamp[3:5], timestamp[6:8], timestamp[9:12]
+        if (hours + minutes + seconds + millis).isdecimal():
+            return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+    return parse_timestamp(timestamp)
+
+
+def parse_srt_lines(lines: Iterable[str]) -> list[Segment]:
+    """Parse SRT lines into segments.
+
+    Only the first text line of each entry is kept (the original text), so SRT
+    files that already contain pinyin or translation lines can be re-processed.
+
+    Args:
+        lines: Lines of an SRT file, with or without line endings
+
+    Returns:
+        List of parsed segments
+
+    Raises:
+        ValueError: If an entry has a malformed timestamp
+    """
+    parsed_segments: list[Segment] = []
+    # The timing line of the entry that is waiting for its first text line
+    timing: str | None = None
+    for raw_line in lines:
+        line = raw_line.strip()
+        if "-->" in line:
+            timing = line
+        elif not line:
+            timing = None
+        elif timing is not None:
+            # Only use the first line of text (the original Chinese)
+            # This handles cases where the SRT already has pinyin/translation
+            start, _, end = timing.partition("-->")
+            parsed_segments.append(
+                Segment(start=_parse_timecode(start.rstrip()), end=_parse_timecode(end.lstrip()), text=line)
+            )
+            timing = None
+        # Anything else is a sequence number or a continuation text line
+    return parsed_segments
+
+
+def parse_srt(srt_content: str) -> list[Segment]:
+    """Parse SRT content into segments.
+
+    Args:
+        srt_content: Contents of an SRT file
+
+    Returns:
+        List of parsed segments
+
+    Raises:
+        ValueError: If an entry has a malformed timestamp
+    """
+    # Every entry has a timing line; skip the scan for content without one.
+    # read_srt has no such shortcut, since it would have to read the whole file first.
+    if "-->" not in srt_content:
+        return []
+    return parse_srt_lines(srt_content.splitlines())
+
+
+def read_srt(path: Path) -> list[Segment]:
+    """Read and parse an SRT file.
+
+    The file is scanned line by line rather than read into one string.
+
+    Args:
+        path: Path to the SRT file
+
+    Returns:
+        List of parsed segments
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If an entry has a malformed timestamp
+    """
+    with path.open(encoding="utf-8", buffering=SRT_READ_BUFFER_SIZE) as f:
+        return parse_srt_lines(f)
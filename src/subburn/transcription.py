@@ -2,18 +2,19 @@
 
 import logging
 import os
-import subprocess
+import tempfile
+from collections.abc import Callable
 from pathlib import Path
 
-import click
 import jieba
-import openai
 from pypinyin import Style, pinyin
 from rich.progress import Progress, TaskID
 
+from .cache import compute_cache_key, compute_file_hash, load_from_cache, save_to_cache
+from .openai_client import get_openai_client
 from .translation import contains_chinese, translate_segments
 from .types import OpenAIKeyException, Segment, SubtitleOptions
-from .utils import convert_to_cjk_punctuation, format_timestamp
+from .utils import convert_to_cjk_punctuation, format_timestamp, write_text_if_changed
 
 # Configure jieba logger to suppress default messages
 jieba_logger = logging.getLogger("jieba")
@@ -22,6 +23,8 @@ jieba_logger.setLevel(logging.ERROR)
 # Avoid printing loading message by setting silent mode
 jieba.setLogLevel(logging.ERROR)
 
+WHISPER_MODEL = "whisper-1"
+
 
 def generate_pinyin(text: str) -> str:
     """Generate pinyin for Chinese text with word segmentation."""
@@ -63,7 +66,7 @@ def create_srt_from_segments(
     if not segments:
         return ""
 
-    srt_lines = []
+    entries = []
     for i, segment in enumerate(segments, 1):
         start_time = format_timestamp(segment.start)
         end_time = format_timestamp(segment.end)
@@ -90,56 +93,10 @@ def create_srt_from_segments(
             )
             lines.append(translation_with_style)
 
-        srt_lines.extend(
-            [
-                str(i),
-                f"{start_time} --> {end_time}",
-                "\n".join(lines),
-                "",  # Empty line between entries
-            ]
-        )
-    return "\n".join(srt_lines)
-
-
-def get_audio_duration(file_path: str, progress: Progress, task_id: TaskID, verbose: bool = False) -> float:
-    """Get duration of audio/video file using ffprobe.
-
-    Args:
-        file_path: Path to the audio/video file
-        progress: Progress bar object for displaying progress
-        task_id: ID of the progress bar task
-        verbose: Whether to print detailed ffprobe output
+        entries.append(f"{i}\n{start_time} --> {end_time}\n" + "\n".join(lines) + "\n")
 
-    Returns:
-        Duration of the audio/video file in seconds
-    """
-    progress.update(task_id, description="Getting audio duration")
-
-    # Set verbosity level for ffprobe
-    verbosity = "info" if verbose else "error"
-
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                verbosity,  # Use verbosity level based on verbose flag
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                file_path,
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        duration = float(result.stdout.strip())
-        progress.update(task_id, advance=5)
-        return duration
-    except (subprocess.CalledProcessError, ValueError) as e:
-        raise click.ClickException(f"Failed to get audio duration: {e}") from e
+    # Entries are separated by an empty line
+    return "\n".join(entries)
 
 
 def transcribe_audio(
@@ -147,44 +104,82 @@ def transcribe_audio(
     progress: Progress,
     task_id: TaskID,
     options: SubtitleOptions,
-) -> tuple[Path, list[Segment]]:
-    """Transcribe audio using OpenAI Whisper API with optional translation."""
+    cached: bool = True,
+    compress_upload: bool = False,
+    on_segments: Callable[[list[Segment]], None] | None = None,
+) -> tuple[Path, list[Segment], float]:
+    """Transcribe audio using OpenAI Whisper API with optional translation.
+
+    Transcriptions are cached by the content of the audio file, so re-running
+    on the same audio doesn't call the API again. With cached false, the cache
+    is neither read nor written. With compress_upload, the audio is re-encoded
+    as low-bitrate Opus before it is uploaded.
+
+    on_segments, if given, is called with the transcribed segments before they
+    are translated, so that the caller can start other work on them.
+
+    Returns the SRT path, the segments, and the audio duration reported by Whisper.
+    """
     if "OPENAI_API_KEY" not in os.environ:
         raise OpenAIKeyException("transcription")
 
-    client = openai.OpenAI()
     progress.update(task_id, description="Transcribing audio", advance=10)
 
-    with open(audio_path, "rb") as audio_file:
-        response = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file,
-            response_format="verbose_json",
-        )
+    cache_key = None
+    transcription = None
+    if cached:
+        # Transcripts of the compressed upload are kept apart from full-quality ones
+        key_params = {"audio": compute_file_hash(audio_path), "model": WHISPER_MODEL}
+        if compress_upload:
+            from .media import UPLOAD_AUDIO_BITRATE
+
+            key_params["upload"] = f"opus-{UPLOAD_AUDIO_BITRATE}"
+        cache_key = compute_cache_key(**key_params)
+        transcription = load_from_cache("transcription", cache_key)
+    if transcription is None:
+        client = get_openai_client()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            upload_path = audio_path
+            if compress_upload:
+                from .media import compress_audio_for_upload
+
+                progress.update(task_id, description="Compressing audio for upload")
+                upload_path = Path(temp_dir) / f"{audio_path.stem}.ogg"
+                compress_audio_for_upload(audio_path, upload_path)
+
+            progress.update(task_id, description="Transcribing audio")
+            with open(upload_path, "rb") as audio_file:
+                response = client.audio.transcriptions.create(
+                    model=WHISPER_MODEL,
+                    file=audio_file,
+                    response_format="verbose_json",
+                )
+
+        transcription = {
+            "duration": float(response.duration),
+            "segments": [
+                {"start": float(seg.start), "end": float(seg.end), "text": seg.text} for seg in response.segments or []
+            ],
+        }
+        if cache_key is not None:
+            save_to_cache("transcription", cache_key, transcription)
 
     progress.update(task_id, description="Processing segments", advance=10)
 
-    # Convert OpenAI segments to our format
-    segments: list[Segment] = []
-    if response.segments is not None:
-        for seg in response.segments:
-            segment = Segment(
-                start=float(seg.start),
-                end=float(seg.end),
-                text=seg.text,
-            )
-            segments.append(segment)
+    # Convert the transcribed segments to our format
+    segments = [Segment(**seg) for seg in transcription["segments"]]
+    if on_segments:
+        on_segments(segments)
 
     # Add translations if requested
     if options.show_translation and segments:
         progress.update(task_id, description="Translating segments", advance=10)
-        segments = translate_segments(segments)
+        segments = translate_segments(segments, cached=cached)
 
     # Create SRT file with pinyin and translation options
     srt_content = create_srt_from_segments(segments, options=options)
     srt_path = audio_path.with_suffix(".srt")
-    with open(srt_path, "w", encoding="utf-8") as f:
-        f.write(srt_content)
+    write_text_if_changed(srt_path, srt_content)
 
     progress.update(task_id, description="Transcription complete", advance=100)
-    return srt_path, segments
+    return srt_path, segments, transcription["duration"]
@@ -4,11 +4,12 @@ import json
 import os
 from typing import Any
 
-import openai
 from pydantic import BaseModel
 
 from .cache import cached
+from .openai_client import get_openai_client
 from .types import OpenAIKeyException, Segment
+from .utils import CHINESE_CHAR_RE
 
 
 class Translation(BaseModel):
@@ -40,7 +41,7 @@ DEFAULT_MODEL_PARAMS = TranslationModelParams()
 
 def contains_chinese(text: str) -> bool:
     """Check if text contains Chinese characters."""
-    return any("\u4e00" <= c <= "\u9fff" for c in text)
+    return CHINESE_CHAR_RE.search(text) is not None
 
 
 def get_translation_key_params(**kwargs: Any) -> dict[str, Any]:
@@ -90,7 +91,7 @@ def translate_segments(
     if "OPENAI_API_KEY" not in os.environ:
         raise OpenAIKeyException("translation")
 
-    client = openai.OpenAI()
+    client = get_openai_client()
 
     # Create a copy of the segments to avoid modifying the original
     segments_copy = [
@@ -1,6 +1,7 @@
 """Common types used across subburn modules."""
 
 from dataclasses import dataclass
+from pathlib import Path
 
 import click
 
@@ -47,9 +48,13 @@ class MovieConfig:
     height: int = 1024
 
     # Video options
-    video_quality: str = "medium"  # ffmpeg preset
+    video_encoder: str = "libx264"  # ffmpeg encoder, or "auto" to use a hardware encoder if available
+    video_quality: str = "veryfast"  # libx264 preset; static backgrounds gain little from slower presets
     crf: int = 23  # quality level (lower = better)
 
+    # Parent directory for working files; None uses /dev/shm when available, else the system default
+    temp_dir: Path | None = None
+
 
 class OpenAIKeyException(click.ClickException):
     """Exception raised when the OpenAI API key is not set."""
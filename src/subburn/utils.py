@@ -2,12 +2,53 @@
 
 import mimetypes
 import os
+import re
 import subprocess
 import sys
 from pathlib import Path
 
 import click
 
+# Matches a character in the CJK Unified Ideographs block
+CHINESE_CHAR_RE = re.compile("[\u4e00-\u9fff]")
+
+# Media types of common input file extensions; other extensions fall back to
+# mimetypes, which loads the system MIME database on first use
+EXTENSION_TYPES = {
+    ".srt": "subtitle",
+    ".mp3": "audio",
+    ".wav": "audio",
+    ".m4a": "audio",
+    ".flac": "audio",
+    ".aac": "audio",
+    ".ogg": "audio",
+    ".opus": "audio",
+    ".mp4": "video",
+    ".mov": "video",
+    ".mkv": "video",
+    ".webm": "video",
+    ".png": "image",
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".webp": "image",
+}
+
+# Translation table from ASCII punctuation to CJK punctuation
+CJK_PUNCTUATION_TABLE = str.maketrans(
+    {
+        ",": "，",
+        ".": "。",
+        "!": "！",
+        "?": "？",
+        ":": "：",
+        ";": "；",
+        "(": "（",
+        ")": "）",
+        "[": "【",
+        "]": "】",
+    }
+)
+
 
 class InputFiles:
     """Container for input files."""
@@ -21,52 +62,55 @@ class InputFiles:
 
 def format_timestamp(seconds: float) -> str:
     """Format seconds into SRT timestamp format."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    seconds = seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}".replace(".", ",")
+    # Round to whole milliseconds first, so that e.g. 59.9996 carries into the minutes
+    hours, millis = divmod(round(seconds * 1000), 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
 def convert_to_cjk_punctuation(text: str) -> str:
     """Convert ASCII punctuation to CJK punctuation for Chinese text."""
     # Only convert if the text contains Chinese characters
-    if not any("\u4e00" <= c <= "\u9fff" for c in text):
+    if not CHINESE_CHAR_RE.search(text):
         return text
 
-    # Map of ASCII punctuation to CJK punctuation
-    punctuation_map = {
-        ",": "，",
-        ".": "。",
-        "!": "！",
-        "?": "？",
-        ":": "：",
-        ";": "；",
-        "(": "（",
-        ")": "）",
-        "[": "【",
-        "]": "】",
-        '"': '"',
-        "'": "'",
-    }
+    return text.translate(CJK_PUNCTUATION_TABLE)
 
-    for ascii_punct, cjk_punct in punctuation_map.items():
-        text = text.replace(ascii_punct, cjk_punct)
 
-    return text
+def write_text_if_changed(path: Path, content: str) -> bool:
+    """Write text to a file unless it already has exactly that content.
+
+    Args:
+        path: File to write
+        content: Text to write, encoded as UTF-8
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except (OSError, UnicodeDecodeError):
+        # Missing or unreadable files are simply (re)written
+        pass
+    path.write_text(content, encoding="utf-8")
+    return True
 
 
 def compute_output_path(input_files: InputFiles, output_dir: Path | None = None) -> Path:
     """Compute output path based on input files.
 
-    If output_dir is provided and is a directory, the output file will be
-    placed in that directory with a name derived from the input file.
+    If output_dir is provided, the output file will be placed in that
+    directory with a name derived from the input file. The caller is
+    responsible for checking that it is a directory.
     """
     base_path = input_files.audio or input_files.video
     if not base_path:
         raise click.BadParameter("No input file found")
 
-    # If output_dir is provided and is a directory, create a filename in that directory
-    if output_dir and output_dir.is_dir():
+    # If output_dir is provided, create a filename in that directory
+    if output_dir:
         # Preserve original filename formatting, just change the extension to .mp4
         filename = f"{base_path.stem}.mp4"
         return output_dir / filename
@@ -156,13 +200,14 @@ def classify_file(path: Path, verbose: bool = False) -> str:
     Returns:
         File type classification as a string: "audio", "video", "image", or "subtitle"
     """
-    mime_type, _ = mimetypes.guess_type(str(path))
-    if not mime_type:
-        if path.suffix.lower() == ".srt":
-            return "subtitle"
-        raise click.BadParameter(f"Could not determine type of file: {path}")
+    main_type = EXTENSION_TYPES.get(path.suffix.lower())
+    mime_type = None
+    if main_type is None:
+        mime_type, _ = mimetypes.guess_type(str(path))
+        if not mime_type:
+            raise click.BadParameter(f"Could not determine type of file: {path}")
+        main_type = mime_type.split("/")[0]
 
-    main_type = mime_type.split("/")[0]
     if main_type == "audio":
         return "audio"
     elif main_type == "video":
@@ -172,7 +217,7 @@ def classify_file(path: Path, verbose: bool = False) -> str:
         return "video"
     elif main_type == "image":
         return "image"
-    elif path.suffix.lower() == ".srt":
+    elif main_type == "subtitle":
         return "subtitle"
     raise click.BadParameter(f"Unsupported file type: {path} ({mime_type})")
 
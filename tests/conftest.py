@@ -2,6 +2,14 @@
 
 import pytest
 
+from subburn.openai_client import get_openai_client
+
+
+@pytest.fixture(autouse=True)
+def reset_openai_client() -> None:
+    """Drop the shared OpenAI client so each test sees its own patched client."""
+    get_openai_client.cache_clear()
+
 
 @pytest.fixture
 def sample_srt() -> str:
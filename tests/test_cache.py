@@ -15,6 +15,7 @@ from subburn.cache import (
     compute_cache_key,
     compute_content_hash,
     ensure_cache_dir,
+    flush_cache,
     get_cache_path,
     load_from_cache,
     save_to_cache,
@@ -88,6 +89,11 @@ class TestCacheUtils:
         key5 = compute_cache_key(list_param=[1, 2, 3], dict_param={"a": 1})
         key6 = compute_cache_key(list_param=[1, 2, 3], dict_param={"a": 1})
         assert key5 == key6
+        
+        # Values with the same textual form but different types should not collide
+        assert compute_cache_key(param=1) != compute_cache_key(param="1")
+        assert compute_cache_key(param=[1, 2]) != compute_cache_key(param="[1, 2]")
+        assert compute_cache_key(param=["a", "b"]) != compute_cache_key(param=["ab"])
 
     @patch("subburn.cache.ensure_cache_dir")
     def test_get_cache_path(self, mock_ensure_cache_dir) -> None:
@@ -102,12 +108,18 @@ class TestCacheUtils:
         mock_ensure_cache_dir.assert_called_once()
 
     @patch("pathlib.Path.mkdir")
-    def test_ensure_cache_dir(self, mock_mkdir) -> None:
+    def test_ensure_cache_dir(self, mock_mkdir, tmp_path: Path) -> None:
         """Test cache directory creation."""
-        ensure_cache_dir()
-        
-        # Check that mkdir was called with correct parameters
-        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+        # Use a directory this process has not created yet
+        with patch("subburn.cache.CACHE_DIR", tmp_path / "cache"):
+            ensure_cache_dir()
+            
+            # Check that mkdir was called with correct parameters
+            mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+            
+            # Subsequent calls don't touch the filesystem again
+            ensure_cache_dir()
+            mock_mkdir.assert_called_once()
 
     def test_save_and_load_from_cache(self) -> None:
         """Test saving to and loading from cache."""
@@ -125,6 +137,10 @@ class TestCacheUtils:
                 # Save to cache
                 save_to_cache(cache_type, cache_key, test_data)
                 
+                # Pending writes are served before they reach disk
+                assert load_from_cache(cache_type, cache_key) == test_data
+                flush_cache()
+                
                 # Check that the file was created
                 cache_path = get_cache_path(cache_type, cache_key)
                 assert cache_path.exists()
@@ -143,6 +159,51 @@ class TestCacheUtils:
                 assert non_existent is None
 
 
+    def test_cache_entries_are_copies(self, tmp_path: Path) -> None:
+        """Test that mutating saved or loaded data doesn't change the cached entry."""
+        with patch("subburn.cache.CACHE_DIR", tmp_path):
+            data = {"items": [1, 2]}
+            save_to_cache("test_type", "copy_key", data)
+            data["items"].append(3)
+
+            loaded = load_from_cache("test_type", "copy_key")
+            assert loaded == {"items": [1, 2]}
+            loaded["items"].append(4)
+            assert load_from_cache("test_type", "copy_key") == {"items": [1, 2]}
+            flush_cache()
+
+    def test_flush_keeps_entries_loadable(self, tmp_path: Path) -> None:
+        """Test that an entry being flushed can be loaded before its file is in place."""
+        real_replace = os.replace
+        loaded_during_flush = []
+
+        def replace(src: Path, dst: Path) -> None:
+            loaded_during_flush.append(load_from_cache("test_type", "flush_key"))
+            real_replace(src, dst)
+
+        with patch("subburn.cache.CACHE_DIR", tmp_path):
+            save_to_cache("test_type", "flush_key", {"value": 1})
+            with patch("subburn.cache.os.replace", side_effect=replace):
+                flush_cache()
+
+            assert loaded_during_flush == [{"value": 1}]
+            assert load_from_cache("test_type", "flush_key") == {"value": 1}
+
+    def test_save_keeps_other_files_in_memory(self, tmp_path: Path) -> None:
+        """Test that saving one entry doesn't drop the remembered contents of others."""
+        with patch("subburn.cache.CACHE_DIR", tmp_path):
+            get_cache_path("test_type", "read_key").write_text('{"value": 1}', encoding="utf-8")
+            assert load_from_cache("test_type", "read_key") == {"value": 1}
+
+            save_to_cache("test_type", "other_key", {"value": 2})
+            flush_cache()
+
+            # Served from memory rather than re-read from disk
+            get_cache_path("test_type", "read_key").unlink()
+            assert load_from_cache("test_type", "read_key") == {"value": 1}
+            assert load_from_cache("test_type", "other_key") == {"value": 2}
+
+
 class TestCachedDecorator:
     """Test the @cached decorator."""
     
@@ -281,6 +342,78 @@ class TestCachedDecorator:
         assert result == {"result": 42}  # Returns the full cache data
         assert call_count[0] == 1  # Function not called again
     
+    @patch("subburn.cache.load_from_cache")
+    def test_cached_decorator_schema_defaults(self, mock_load) -> None:
+        """Test that trusted cache data gets schema defaults and loses unknown keys."""
+        class ResultSchema(BaseModel):
+            result: int
+            source: str = "cache"
+        
+        mock_load.return_value = {"result": 42, "stale_field": True}
+        
+        @cached(cache_type="test", cache_schema=ResultSchema)
+        def sample_function(a: int, b: int) -> int:
+            return a + b
+        
+        assert sample_function(2, 3) == {"result": 42, "source": "cache"}
+    
+    @patch("subburn.cache.load_from_cache")
+    def test_cached_decorator_with_strict_validation(self, mock_load) -> None:
+        """Test that strict_validate rejects cache data with the wrong field types."""
+        class ResultSchema(BaseModel):
+            result: int
+        
+        # Required field is present but has the wrong type
+        mock_load.return_value = {"result": "not a number"}
+        
+        @cached(cache_type="test", cache_schema=ResultSchema)
+        def trusting_function(a: int, b: int) -> int:
+            return a + b
+        
+        @cached(cache_type="test", cache_schema=ResultSchema, strict_validate=True)
+        def strict_function(a: int, b: int) -> int:
+            return a + b
+        
+        # Trusted data is returned without type validation
+        assert trusting_function(2, 3) == {"result": "not a number"}
+        # Strict validation treats the bad data as a cache miss
+        assert strict_function(2, 3) == 5
+    
+    @patch("subburn.cache.load_from_cache")
+    def test_cached_decorator_key_includes_defaults(self, mock_load) -> None:
+        """Test that equivalent calls map to the same cache key."""
+        mock_load.return_value = None
+        
+        @cached(cache_type="test")
+        def sample_function(a: int, b: int = 1) -> int:
+            return a + b
+        
+        sample_function(2)
+        sample_function(2, 1)
+        sample_function(a=2, b=1)
+        sample_function(2, b=3)
+        
+        keys = [call.args[1] for call in mock_load.call_args_list]
+        assert keys[0] == keys[1] == keys[2]
+        assert keys[3] != keys[0]
+    
+    @patch("subburn.cache.load_from_cache")
+    def test_cached_decorator_rejects_invalid_calls(self, mock_load) -> None:
+        """Test that invalid arguments raise TypeError before the cache is consulted."""
+        mock_load.return_value = {"result": 42}
+
+        @cached(cache_type="test")
+        def sample_function(a: int, b: int = 1) -> int:
+            return a + b
+
+        with pytest.raises(TypeError):
+            sample_function(2, c=3)
+        with pytest.raises(TypeError):
+            sample_function(2, a=3)
+        with pytest.raises(TypeError):
+            sample_function(b=3)
+        mock_load.assert_not_called()
+
     @patch("subburn.cache.load_from_cache")
     def test_cached_decorator_with_key_generator(self, mock_load) -> None:
         """Test @cached decorator with key generator."""
@@ -1,11 +1,14 @@
 """Test the CLI module."""
 
+import threading
+import time
 from collections.abc import Generator
 from pathlib import Path
 
 import pytest
 from typer.testing import CliRunner
 
+from subburn.cli import app, background_executor
 from subburn.utils import (
     InputFiles,
     classify_file,
@@ -13,6 +16,7 @@ from subburn.utils import (
     compute_output_path,
     convert_to_cjk_punctuation,
     format_timestamp,
+    write_text_if_changed,
 )
 
 
@@ -46,6 +50,9 @@ def test_format_timestamp() -> None:
     assert format_timestamp(0) == "00:00:00,000"
     assert format_timestamp(3661.5) == "01:01:01,500"
     assert format_timestamp(7322.75) == "02:02:02,750"
+    # Rounding up to a whole second carries into the minutes and hours
+    assert format_timestamp(59.9996) == "00:01:00,000"
+    assert format_timestamp(3599.9999) == "01:00:00,000"
 
 
 def test_convert_cjk_punctuation() -> None:
@@ -55,6 +62,7 @@ def test_convert_cjk_punctuation() -> None:
     # Should convert punctuation in Chinese text
     assert convert_to_cjk_punctuation("你好, 世界!") == "你好， 世界！"
     assert convert_to_cjk_punctuation("问题?") == "问题？"
+    assert convert_to_cjk_punctuation('[注意] (他说: "好.")') == '【注意】 （他说： "好。"）'
 
 
 def test_classify_file(temp_files: dict[str, Path]) -> None:
@@ -65,6 +73,14 @@ def test_classify_file(temp_files: dict[str, Path]) -> None:
     assert classify_file(temp_files["image"]) == "image"
 
 
+def test_classify_file_by_extension(tmp_path: Path) -> None:
+    """Test that common suffixes are classified without consulting the mimetypes database."""
+    for name, expected in [("a.ogg", "audio"), ("a.OPUS", "audio"), ("i.webp", "image"), ("s.SRT", "subtitle")]:
+        path = tmp_path / name
+        path.touch()
+        assert classify_file(path) == expected
+
+
 def test_collect_input_files(temp_files: dict[str, Path]) -> None:
     """Test input file collection."""
     files = [temp_files["audio"], temp_files["subtitle"]]
@@ -83,3 +99,47 @@ def test_compute_output_path(temp_files: dict[str, Path]) -> None:
     output = compute_output_path(input_files)
     assert output.name.startswith("test")
     assert output.suffix == ".mp4"
+
+    output_dir = temp_files["audio"].parent / "out"
+    assert compute_output_path(input_files, output_dir=output_dir) == output_dir / f"{temp_files['audio'].stem}.mp4"
+
+
+def test_main_refuses_to_overwrite_input(runner: CliRunner, temp_files: dict[str, Path]) -> None:
+    """Test that the output path may not resolve to an input file."""
+    audio = temp_files["audio"]
+    # Refer to the same file through a path that only matches once ".." is resolved
+    (audio.parent / "sub").mkdir()
+    alias = audio.parent / "sub" / ".." / audio.name
+    result = runner.invoke(app, [str(audio), str(temp_files["subtitle"]), "-o", str(alias)])
+    assert result.exit_code != 0
+    assert "would overwrite input file" in str(result.exception or result.output)
+
+
+def test_write_text_if_changed(tmp_path: Path) -> None:
+    """Test that files are only rewritten when their content changes."""
+    path = tmp_path / "test.srt"
+    assert write_text_if_changed(path, "你好") is True
+    assert path.read_text(encoding="utf-8") == "你好"
+    assert write_text_if_changed(path, "你好") is False
+    assert write_text_if_changed(path, "再见") is True
+    assert path.read_text(encoding="utf-8") == "再见"
+
+
+def test_background_executor_stops_tasks_on_error() -> None:
+    """Test that an error signals background tasks and is raised without waiting for them."""
+    started = threading.Event()
+
+    def task(stop: threading.Event) -> bool:
+        started.set()
+        return stop.wait(5)
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError), background_executor(max_workers=1) as (executor, stop):
+        future = executor.submit(task, stop)
+        pending = executor.submit(task, stop)
+        started.wait(5)
+        raise RuntimeError("translation failed")
+
+    assert future.result(timeout=5) is True
+    assert pending.cancelled()
+    assert time.monotonic() - start < 5
@@ -0,0 +1,101 @@
+"""Tests for image generation."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from subburn.image_gen import generate_image, generate_images_for_segments, prune_image_cache
+from subburn.types import Segment
+
+
+@pytest.fixture
+def images_generate() -> Iterator[MagicMock]:
+    """Patch the DALL-E API and image downloads, and return the mocked generate call."""
+    response = SimpleNamespace(data=[SimpleNamespace(url="https://example.com/image.png")])
+
+    with (
+        patch.dict("os.environ", {"OPENAI_API_KEY": "fake-key"}),
+        patch("openai.OpenAI") as mock_openai,
+        patch("httpx.stream") as mock_stream,
+    ):
+        download = mock_stream.return_value.__enter__.return_value
+        download.status_code = 200
+        download.iter_bytes.return_value = [b"p", b"ng"]
+        generate = mock_openai.return_value.images.generate
+        generate.return_value = response
+        yield generate
+
+
+class TestGenerateImage:
+    """Test image generation."""
+
+    def test_generate_image_reuses_existing_image(self, tmp_path: Path, images_generate: MagicMock) -> None:
+        """Test that an image generated for the same prompt is reused without an API call."""
+        first_path = generate_image("你好", "A minimalist scene", tmp_path)
+        second_path = generate_image("你好", "A minimalist scene", tmp_path)
+        other_path = generate_image("再见", "A minimalist scene", tmp_path)
+
+        assert first_path is not None
+        assert first_path.read_bytes() == b"png"
+        assert second_path == first_path
+        assert other_path != first_path
+        assert images_generate.call_count == 2
+
+    def test_generate_image_without_cache(self, tmp_path: Path, images_generate: MagicMock) -> None:
+        """Test that cached=False generates the image again."""
+        first_path = generate_image("你好", "A minimalist scene", tmp_path)
+        second_path = generate_image("你好", "A minimalist scene", tmp_path, cached=False)
+
+        assert second_path == first_path
+        assert images_generate.call_count == 2
+
+    def test_generate_image_removes_partial_download(self, tmp_path: Path, images_generate: MagicMock) -> None:
+        """Test that a failed download leaves neither an image nor a temporary file behind."""
+
+        def broken_download(chunk_size: int) -> Iterator[bytes]:
+            yield b"p"
+            raise OSError("connection reset")
+
+        with patch("httpx.stream") as mock_stream:
+            download = mock_stream.return_value.__enter__.return_value
+            download.status_code = 200
+            download.iter_bytes.side_effect = broken_download
+            assert generate_image("你好", "A minimalist scene", tmp_path) is None
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestGenerateImagesForSegments:
+    """Test generating images for subtitle segments."""
+
+    def test_repeated_text_shares_one_image(self, tmp_path: Path, images_generate: MagicMock) -> None:
+        """Test that segments with the same text are generated once and all get the image."""
+        segments = [
+            Segment(start=0.0, end=1.0, text="好"),
+            Segment(start=1.0, end=2.0, text="好"),
+            Segment(start=2.0, end=3.0, text="不好"),
+        ]
+
+        with patch("subburn.cache.CACHE_DIR", tmp_path):
+            image_timestamps = generate_images_for_segments(segments, "A minimalist scene", MagicMock())
+
+        assert images_generate.call_count == 2
+        assert image_timestamps.keys() == {0.0, 1.0, 2.0}
+        assert image_timestamps[0.0] == image_timestamps[1.0] != image_timestamps[2.0]
+
+
+def test_prune_image_cache_deletes_least_recently_used(tmp_path: Path) -> None:
+    """Test that pruning keeps the newest images and the ones in use."""
+    paths = [tmp_path / f"{i}.png" for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_bytes(b"png")
+        os.utime(path, (i, i))
+
+    with patch("subburn.image_gen.MAX_CACHED_IMAGES", 2):
+        prune_image_cache(tmp_path, keep={paths[0]})
+
+    assert [path.exists() for path in paths] == [True, False, False, True]
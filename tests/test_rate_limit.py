@@ -0,0 +1,53 @@
+"""Tests for rate limiting."""
+
+import threading
+from unittest.mock import patch
+
+from subburn.rate_limit import RateLimiter
+
+
+class FakeClock:
+    """A monotonic clock that only advances when slept on."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_sleeps_until_oldest_request_expires() -> None:
+    """Test that a request over the limit sleeps exactly until a slot frees up."""
+    clock = FakeClock()
+    limiter = RateLimiter(2)
+
+    with patch("time.monotonic", clock.monotonic), patch("time.sleep", clock.sleep):
+        limiter.wait()
+        clock.now += 10
+        limiter.wait()
+        clock.now += 5
+        limiter.wait()  # The first request expires 45 seconds from now
+        limiter.wait()  # The second request expires 10 seconds after that
+
+    assert clock.sleeps == [45.0, 10.0]
+    assert list(limiter.requests) == [1060.0, 1070.0]
+
+
+def test_rate_limiter_returns_early_when_stopped() -> None:
+    """Test that a stopped wait returns without sleeping or recording a request."""
+    clock = FakeClock()
+    limiter = RateLimiter(1)
+    stop = threading.Event()
+    stop.set()
+
+    with patch("time.monotonic", clock.monotonic), patch("time.sleep", clock.sleep):
+        limiter.wait(stop)
+        limiter.wait(stop)
+
+    assert clock.sleeps == []
+    assert list(limiter.requests) == [1000.0]
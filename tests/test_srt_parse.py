@@ -0,0 +1,102 @@
+"""Tests for SRT parsing."""
+
+from pathlib import Path
+
+import pytest
+
+from subburn.srt_parse import parse_srt, parse_timestamp, read_srt
+from subburn.transcription import create_srt_from_segments
+from subburn.types import Segment, SubtitleOptions
+
+
+class TestParseTimestamp:
+    """Test SRT timestamp parsing."""
+
+    def test_parse_timestamp(self) -> None:
+        """Test conversion of SRT timestamps to seconds."""
+        assert parse_timestamp("00:00:00,000") == 0.0
+        assert parse_timestamp("01:01:01,500") == pytest.approx(3661.5)
+        assert parse_timestamp(" 02:02:02.750 ") == pytest.approx(7322.75)
+
+    def test_parse_timestamp_fraction_digits(self) -> None:
+        """Test that the fractional part is scaled by its number of digits."""
+        assert parse_timestamp("00:00:01,5") == pytest.approx(1.5)
+        assert parse_timestamp("00:00:01,05") == pytest.approx(1.05)
+        assert parse_timestamp("00:00:01") == 1.0
+
+    def test_parse_invalid_timestamp(self) -> None:
+        """Test that malformed timestamps raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid SRT timestamp"):
+            parse_timestamp("not a timestamp")
+
+
+class TestParseSrt:
+    """Test SRT content parsing."""
+
+    def test_parse_srt(self, sample_srt: str) -> None:
+        """Test parsing of basic SRT content."""
+        assert parse_srt(sample_srt) == [
+            Segment(start=0.0, end=2.0, text="Hello, world!"),
+            Segment(start=2.0, end=4.0, text="This is a test."),
+        ]
+
+    def test_parse_srt_keeps_first_text_line(self) -> None:
+        """Test that pinyin and translation lines are dropped."""
+        content = "1\n00:00:01,000 --> 00:00:02,500\n你好\nnǐhǎo\nHello\n"
+        segments = parse_srt(content)
+        assert len(segments) == 1
+        assert segments[0].text == "你好"
+        assert segments[0].start == pytest.approx(1.0)
+        assert segments[0].end == pytest.approx(2.5)
+
+    def test_parse_srt_with_crlf_and_extra_blank_lines(self) -> None:
+        """Test parsing of Windows line endings and irregular spacing."""
+        content = (
+            "\r\n1\r\n00:00:00,000 --> 00:00:01,000\r\nOne\r\n\r\n\r\n2\r\n00:00:01,000 --> 00:00:02,000\r\nTwo\r\n"
+        )
+        assert parse_srt(content) == [
+            Segment(start=0.0, end=1.0, text="One"),
+            Segment(start=1.0, end=2.0, text="Two"),
+        ]
+
+    def test_parse_srt_with_cr_line_endings(self) -> None:
+        """Test parsing of content that uses bare carriage returns as line endings."""
+        content = "1\r00:00:00,000 --> 00:00:01,000\rOne\r\r2\r00:00:01,000 --> 00:00:02,000\rTwo\r"
+        assert [s.text for s in parse_srt(content)] == ["One", "Two"]
+
+    def test_parse_srt_invalid_timestamp(self) -> None:
+        """Test that malformed timing lines raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_srt("1\nbad --> 00:00:01,000\nText\n")
+
+    def test_parse_srt_nonstandard_timestamps(self) -> None:
+        """Test that timestamps outside the fixed "HH:MM:SS,mmm" layout are still parsed."""
+        segments = parse_srt("1\n0:00:01.5 --> 00:00:02,250\nText\n")
+        assert segments[0].start == pytest.approx(1.5)
+        assert segments[0].end == pytest.approx(2.25)
+
+    def test_read_srt(self, tmp_path: Path, sample_srt: str) -> None:
+        """Test reading and parsing an SRT file."""
+        srt_path = tmp_path / "test.srt"
+        srt_path.write_text(sample_srt, encoding="utf-8")
+        assert read_srt(srt_path) == parse_srt(sample_srt)
+
+    def test_read_srt_without_trailing_newline(self, tmp_path: Path) -> None:
+        """Test reading a file whose last line has no line ending."""
+        srt_path = tmp_path / "test.srt"
+        srt_path.write_bytes(b"1\r\n00:00:00,000 --> 00:00:01,000\r\nOne")
+        assert read_srt(srt_path) == [Segment(start=0.0, end=1.0, text="One")]
+
+    def test_parse_empty_srt(self) -> None:
+        """Test parsing of empty content."""
+        assert parse_srt("") == []
+
+    def test_parse_srt_round_trip(self) -> None:
+        """Test that SRT files written by subburn parse back to their segments."""
+        segments = [
+            Segment(start=0.0, end=1.25, text="你好世界", translation="Hello world"),
+            Segment(start=1.25, end=3661.5, text="再见", translation="Goodbye"),
+        ]
+        options = SubtitleOptions(show_pinyin=True, show_translation=True)
+        parsed = parse_srt(create_srt_from_segments(segments, options=options))
+        assert [(s.start, s.end, s.text) for s in parsed] == [(s.start, s.end, s.text) for s in segments]
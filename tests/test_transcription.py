@@ -1,10 +1,15 @@
 """Tests for transcription module."""
 
+from pathlib import Path
+from types import SimpleNamespace
+from typing import BinaryIO
+from unittest.mock import MagicMock, patch
+
 import pytest
 from pypinyin import Style, pinyin
 
-from subburn.transcription import create_srt_from_segments, generate_pinyin
-from subburn.types import Segment, SubtitleOptions
+from subburn.transcription import create_srt_from_segments, generate_pinyin, transcribe_audio
+from subburn.types import OpenAIKeyException, Segment, SubtitleOptions
 
 
 class TestGeneratePinyin:
@@ -106,4 +111,143 @@ class TestCreateSrtFromSegments:
         """Test SRT creation with empty segments list."""
         options = SubtitleOptions(show_pinyin=False, show_translation=False)
         result = create_srt_from_segments([], options=options)
-        assert result == ""
\ No newline at end of file
+        assert result == ""
+
+
+class TestTranscribeAudio:
+    """Test Whisper transcription."""
+
+    def test_transcribe_audio_returns_duration(self, tmp_path: Path) -> None:
+        """Test that the audio duration reported by Whisper is returned."""
+        audio_path = tmp_path / "audio.mp3"
+        audio_path.write_bytes(b"")
+        response = SimpleNamespace(duration=12.5, segments=[SimpleNamespace(start=0, end=2, text="你好")])
+
+        with (
+            patch.dict("os.environ", {"OPENAI_API_KEY": "fake-key"}),
+            patch("openai.OpenAI") as mock_openai,
+            patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+        ):
+            mock_openai.return_value.audio.transcriptions.create.return_value = response
+            srt_path, segments, duration = transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions())
+
+        assert srt_path == audio_path.with_suffix(".srt")
+        assert srt_path.exists()
+        assert segments == [Segment(start=0.0, end=2.0, text="你好")]
+        assert duration == 12.5
+
+    def test_transcribe_audio_uses_cache(self, tmp_path: Path) -> None:
+        """Test that audio with the same content is only transcribed once."""
+        audio_path = tmp_path / "audio.mp3"
+        audio_path.write_bytes(b"audio")
+        response = SimpleNamespace(duration=3.0, segments=[SimpleNamespace(start=0, end=2, text="你好")])
+
+        with (
+            patch.dict("os.environ", {"OPENAI_API_KEY": "fake-key"}),
+            patch("openai.OpenAI") as mock_openai,
+            patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+        ):
+            create = mock_openai.return_value.audio.transcriptions.create
+            create.return_value = response
+            first = transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions())
+
+            # A copy of the audio under another name hits the cache
+            copy_path = tmp_path / "copy.mp3"
+            copy_path.write_bytes(b"audio")
+            second = transcribe_audio(copy_path, MagicMock(), 1, SubtitleOptions())
+            assert create.call_count == 1
+            assert second[1:] == first[1:]
+
+            # The cache can be bypassed, and a bypassed run doesn't overwrite it
+            create.return_value = SimpleNamespace(duration=4.0, segments=[])
+            transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions(), cached=False)
+            assert create.call_count == 2
+            assert transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions())[1:] == first[1:]
+
+    def test_transcribe_audio_requires_api_key(self, tmp_path: Path) -> None:
+        """Test that a missing API key is reported before the audio is read."""
+        with (
+            patch.dict("os.environ", {}, clear=True),
+            patch("subburn.transcription.compute_file_hash") as compute_file_hash,
+            pytest.raises(OpenAIKeyException),
+        ):
+            transcribe_audio(tmp_path / "audio.mp3", MagicMock(), 1, SubtitleOptions())
+        compute_file_hash.assert_not_called()
+
+    def test_transcribe_audio_uploads_compressed_audio(self, tmp_path: Path) -> None:
+        """Test that compress_upload uploads the Opus re-encoding instead of the original audio."""
+        audio_path = tmp_path / "audio.mp3"
+        audio_path.write_bytes(b"audio")
+        response = SimpleNamespace(duration=3.0, segments=[])
+
+        def compress(source: Path, output_path: Path) -> None:
+            output_path.write_bytes(b"opus")
+
+        uploaded: list[tuple[str, bytes]] = []
+
+        def create(file: BinaryIO, **kwargs: object) -> SimpleNamespace:
+            uploaded.append((Path(file.name).name, file.read()))
+            return response
+
+        with (
+            patch.dict("os.environ", {"OPENAI_API_KEY": "fake-key"}),
+            patch("openai.OpenAI") as mock_openai,
+            patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+            patch("subburn.media.compress_audio_for_upload", side_effect=compress),
+        ):
+            mock_openai.return_value.audio.transcriptions.create.side_effect = create
+            transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions(), cached=False, compress_upload=True)
+
+        assert uploaded == [("audio.ogg", b"opus")]
+
+    def test_transcribe_audio_reports_segments_before_translating(self, tmp_path: Path) -> None:
+        """Test that on_segments receives the transcribed segments before translation starts."""
+        audio_path = tmp_path / "audio.mp3"
+        audio_path.write_bytes(b"audio")
+        response = SimpleNamespace(duration=3.0, segments=[SimpleNamespace(start=0, end=2, text="你好")])
+        events: list[str] = []
+
+        def translate(segments: list[Segment], cached: bool) -> list[Segment]:
+            events.append("translate")
+            return segments
+
+        with (
+            patch.dict("os.environ", {"OPENAI_API_KEY": "fake-key"}),
+            patch("openai.OpenAI") as mock_openai,
+            patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+            patch("subburn.transcription.translate_segments", side_effect=translate),
+        ):
+            mock_openai.return_value.audio.transcriptions.create.return_value = response
+            transcribe_audio(
+                audio_path,
+                MagicMock(),
+                1,
+                SubtitleOptions(show_translation=True),
+                on_segments=lambda segments: events.append(f"segments:{len(segments)}"),
+            )
+
+        assert events == ["segments:1", "translate"]
+
+    def test_transcribe_audio_caches_compressed_upload_separately(self, tmp_path: Path) -> None:
+        """Test that a transcript of the compressed upload isn't reused for a full-quality run."""
+        audio_path = tmp_path / "audio.mp3"
+        audio_path.write_bytes(b"audio")
+        response = SimpleNamespace(duration=3.0, segments=[])
+
+        def compress(source: Path, output_path: Path) -> None:
+            output_path.write_bytes(b"opus")
+
+        with (
+            patch.dict("os.environ", {"OPENAI_API_KEY": "fake-key"}),
+            patch("openai.OpenAI") as mock_openai,
+            patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+            patch("subburn.media.compress_audio_for_upload", side_effect=compress),
+        ):
+            create = mock_openai.return_value.audio.transcriptions.create
+            create.return_value = response
+            transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions(), compress_upload=True)
+            transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions(), compress_upload=True)
+            assert create.call_count == 1
+
+            transcribe_audio(audio_path, MagicMock(), 1, SubtitleOptions())
+            assert create.call_count == 2
@@ -4,9 +4,21 @@ import sys
 from pathlib import Path
 from unittest import mock
 
-from subburn.movie import create_subtitles_filter
-from subburn.types import SubtitleOptions
-from subburn.utils import find_cjk_compatible_font
+import click
+import pytest
+from rich.progress import Progress
+
+from subburn.media import compress_audio_for_upload, get_audio_duration
+from subburn.movie import (
+    create_image_list_file,
+    create_movie,
+    create_subtitles_filter,
+    detect_h264_encoder,
+    run_ffmpeg_with_progress,
+    video_encoder_args,
+)
+from subburn.types import MovieConfig, SubtitleOptions
+from subburn.utils import InputFiles, find_cjk_compatible_font
 
 
 def test_create_subtitles_filter():
@@ -96,4 +108,158 @@ def test_find_cjk_compatible_font():
 
             with mock.patch("sys.platform", "linux"):
                 font = find_cjk_compatible_font()
-                assert font == "Noto Sans CJK"
\ No newline at end of file
+                assert font == "Noto Sans CJK"
+
+
+def test_run_ffmpeg_with_progress():
+    """Test progress parsing and error reporting from ffmpeg-style stderr."""
+    progress = mock.MagicMock()
+    script = (
+        "import sys; "
+        "sys.stderr.write('frame=1 time=00:00:01.00\\rframe=2 time=00:00:05.00\\r'); "
+        "sys.stderr.write('line\\n' * 30 + 'final error')"
+    )
+
+    # Disable update throttling so that every status line is reported
+    with pytest.raises(click.ClickException) as exc_info, mock.patch("subburn.movie.PROGRESS_UPDATE_INTERVAL", 0):
+        run_ffmpeg_with_progress(
+            [sys.executable, "-c", script + "; sys.exit(1)"], progress, task_id=1, duration=10.0
+        )
+
+    # Progress is reported as a percentage of the expected duration
+    progress.update.assert_any_call(1, completed=10.0)
+    progress.update.assert_any_call(1, completed=50.0)
+    # Only the last lines of stderr are reported
+    message = exc_info.value.message
+    assert message.endswith("final error")
+    assert "time=" not in message
+
+
+def test_run_ffmpeg_with_progress_reports():
+    """Test parsing of machine-readable "-progress" output."""
+    progress = mock.MagicMock()
+    script = (
+        "import sys; "
+        "sys.stderr.write('out_time_us=N/A\\nprogress=continue\\nout_time_us=2500000\\nspeed=1.5x\\n'); "
+        "sys.stderr.write('Conversion failed!\\n'); sys.exit(1)"
+    )
+
+    with pytest.raises(click.ClickException) as exc_info, mock.patch("subburn.movie.PROGRESS_UPDATE_INTERVAL", 0):
+        run_ffmpeg_with_progress([sys.executable, "-c", script], progress, task_id=1, duration=10.0)
+
+    progress.update.assert_any_call(1, completed=25.0)
+    # Progress reports are left out of the error message
+    assert exc_info.value.message.endswith("Conversion failed!")
+    assert "out_time_us" not in exc_info.value.message
+
+
+def test_video_encoder_args():
+    """Test encoder selection and tuning options."""
+    config = MovieConfig(subtitle_options=SubtitleOptions())
+    args = video_encoder_args(config)
+    assert args[:2] == ["-c:v", "libx264"]
+    assert args[args.index("-tune") + 1] == "stillimage"
+    assert args[args.index("-crf") + 1] == "23"
+
+    # Auto mode uses whichever encoder was detected
+    config = MovieConfig(subtitle_options=SubtitleOptions(), video_encoder="auto")
+    with mock.patch("subburn.movie.detect_h264_encoder", return_value="h264_videotoolbox"):
+        args = video_encoder_args(config)
+    assert args[:2] == ["-c:v", "h264_videotoolbox"]
+    assert "-crf" not in args
+
+
+def test_run_ffmpeg_with_progress_throttles_updates():
+    """Test that bursts of status lines produce a single progress update."""
+    progress = mock.MagicMock()
+    script = "import sys; sys.stderr.write(''.join(f'time=00:00:{i:02d}.00\\r' for i in range(1, 50)))"
+
+    run_ffmpeg_with_progress([sys.executable, "-c", script], progress, task_id=1, duration=100.0)
+
+    percentage_updates = [c for c in progress.update.call_args_list if "completed" in c.kwargs]
+    # One throttled update while running, plus the final completion
+    assert percentage_updates[0].kwargs["completed"] == 1.0
+    assert percentage_updates[-1].kwargs["completed"] == 100
+    assert len(percentage_updates) == 2
+
+
+def test_create_image_list_file(tmp_path):
+    """Test that each image is shown until the next one starts."""
+    image_timestamps = {2.5: Path("/images/b.png"), 0.0: Path("/images/a.png")}
+    list_path = create_image_list_file(image_timestamps, tmp_path)
+    assert list_path.read_text() == "file '/images/a.png'\nduration 2.5\nfile '/images/b.png'\nduration 5.0\n"
+
+
+def test_detect_h264_encoder_is_cached_on_disk(tmp_path):
+    """Test that the encoder probe runs once per ffmpeg binary."""
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_bytes(b"")
+    with (
+        mock.patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+        mock.patch("shutil.which", return_value=str(ffmpeg)),
+        mock.patch("subburn.movie._probe_h264_encoder", return_value="h264_nvenc") as probe,
+    ):
+        # Bypass the in-process memoization to exercise the disk cache
+        assert detect_h264_encoder.__wrapped__() == "h264_nvenc"
+        assert detect_h264_encoder.__wrapped__() == "h264_nvenc"
+    probe.assert_called_once()
+
+
+def test_detect_h264_encoder_does_not_cache_software_fallback(tmp_path):
+    """Test that a failed hardware probe is retried on the next run."""
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_bytes(b"")
+    with (
+        mock.patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+        mock.patch("shutil.which", return_value=str(ffmpeg)),
+        mock.patch("subburn.movie._probe_h264_encoder", return_value="libx264") as probe,
+    ):
+        assert detect_h264_encoder.__wrapped__() == "libx264"
+        assert detect_h264_encoder.__wrapped__() == "libx264"
+    assert probe.call_count == 2
+
+
+def test_get_audio_duration_is_cached(tmp_path):
+    """Test that ffprobe runs again only when the file changes."""
+    audio = tmp_path / "audio.mp3"
+    audio.write_bytes(b"audio")
+    ffprobe_result = mock.Mock(stdout="12.5\n")
+    with (
+        mock.patch("subburn.cache.CACHE_DIR", tmp_path / "cache"),
+        mock.patch("subprocess.run", return_value=ffprobe_result) as run,
+    ):
+        assert get_audio_duration(str(audio), mock.MagicMock(), 1) == 12.5
+        assert get_audio_duration(str(audio), mock.MagicMock(), 1) == 12.5
+        assert run.call_count == 1
+
+        audio.write_bytes(b"longer audio")
+        get_audio_duration(str(audio), mock.MagicMock(), 1)
+        assert run.call_count == 2
+
+
+def test_compress_audio_for_upload_reports_missing_ffmpeg(tmp_path):
+    """Test that a missing ffmpeg is reported as a ClickException."""
+    with (
+        mock.patch("subprocess.run", side_effect=FileNotFoundError("No such file or directory: 'ffmpeg'")),
+        pytest.raises(click.ClickException, match="Failed to compress audio for upload"),
+    ):
+        compress_audio_for_upload(tmp_path / "audio.mp3", tmp_path / "audio.ogg")
+
+
+def test_create_movie_reports_progress_for_first_task(tmp_path):
+    """Test that create_movie tracks progress with a Progress's first task, whose id is 0."""
+    input_files = InputFiles()
+    input_files.audio = tmp_path / "audio.mp3"
+    input_files.subtitle = tmp_path / "audio.srt"
+    config = MovieConfig(subtitle_options=SubtitleOptions(font_name="Arial"), temp_dir=tmp_path)
+
+    progress = Progress()
+    task_id = progress.add_task("Processing", total=100)
+    assert task_id == 0
+
+    with mock.patch("subburn.movie.run_ffmpeg_with_progress") as run:
+        create_movie(tmp_path / "out.mov", input_files, config, None, 3.0, progress, task_id)
+
+    cmd = run.call_args.args[0]
+    assert cmd[2:5] == ["-progress", "pipe:2", "-nostats"]
+    assert run.call_args.args[1:3] == (progress, task_id)